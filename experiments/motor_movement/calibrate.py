@@ -5,11 +5,88 @@ Helps calibrate steps/mm, flow curves, and test patterns
 """
 
 import asyncio
+import json
 import sys
+from itertools import repeat
 from pathlib import Path
+from typing import List
 
-import config
-from ssg_sender import SSGSender
+import numpy as np
+
+from config import (
+    ESP32_IP, STEPS_PER_MM_X, STEPS_PER_MM_Y,
+    X_MIN_MM, X_MAX_MM, Y_MIN_MM, Y_MAX_MM, PLATE_RADIUS_SQ_MM,
+)
+from ssg_sender import SSGSender, run_async
+
+
+# ============================================
+# TEST PATTERN TEMPLATES
+# ============================================
+# Fixed lines shared by every run of a pattern - only sizes/flows vary
+
+PATTERN_PREFIX = (
+    "N1 G28",     # Home
+    "N2 M3 S60",  # Sauce on (or pen down)
+)
+SQUARE_SUFFIX = (
+    "N8 M5",  # Sauce off
+    "N9 G0 X0.00 Y0.00 F3000",
+)
+
+# Bound str.format of a precompiled template: one call per generated move
+G1_LINE = "N{} G1 X{:.2f} Y{:.2f} F{}".format
+G0_LINE = "N{} G0 X{:.2f} Y{:.2f} F{}".format
+
+# One ladder rung: travel to the row, sauce on, draw, sauce off
+FLOW_LADDER_FLOWS = (20, 40, 60, 80)
+FLOW_RUNG_TEMPLATE = (
+    "N{0} G0 X0.00 Y{y:.2f} F3000\n"
+    "N{1} M3 S{flow}\n"
+    "N{2} G1 X{length:.2f} Y{y:.2f} F600\n"
+    "N{3} M5"
+)
+
+
+# Steps/mm measurements persist across sessions, keyed by axis and the
+# config value they were taken against (changing config starts a new history)
+CALIBRATION_HISTORY = Path(__file__).with_name(".calibration_history.json")
+
+
+def record_measurement(axis: str, steps_per_mm: float, commanded: float, actual: float) -> List[float]:
+    """
+    Append a commanded/actual ratio to the on-disk history
+    
+    Returns:
+        All ratios recorded for this axis at the current steps/mm
+    """
+    try:
+        history = json.loads(CALIBRATION_HISTORY.read_text())
+    except (OSError, ValueError):
+        history = {}
+    ratios = history.setdefault(f"{axis}@{steps_per_mm}", [])
+    ratios.append(commanded / actual)
+    CALIBRATION_HISTORY.write_text(json.dumps(history, indent=2))
+    return ratios
+
+
+def within_limits(xs: np.ndarray, ys: np.ndarray) -> bool:
+    """Check all pattern vertices against the soft limits and plate radius in one pass"""
+    outside = (
+        (xs < X_MIN_MM) | (xs > X_MAX_MM) |
+        (ys < Y_MIN_MM) | (ys > Y_MAX_MM) |
+        (xs * xs + ys * ys > PLATE_RADIUS_SQ_MM)
+    )
+    return not outside.any()
+
+
+async def aio_input(prompt: str = "") -> str:
+    """
+    Non-blocking input(): reads stdin in a worker thread so the event loop
+    (receive loop, telemetry, keepalive pings) keeps running while the user
+    is at the prompt
+    """
+    return await asyncio.get_running_loop().run_in_executor(None, input, prompt)
 
 
 class Calibrator:
@@ -47,12 +124,14 @@ class Calibrator:
         print("4. Calculate correct steps/mm value")
         print()
         
-        input("Press Enter to start, or Ctrl-C to cancel...")
+        await aio_input("Press Enter to start, or Ctrl-C to cancel...")
         
         # Home first
         print("\nHoming...")
         await self.sender.send_home()
-        await asyncio.sleep(15)  # Wait for homing
+        if not await self.sender.wait_for_home():
+            print("Homing did not complete (timeout)")
+            return
         
         # Move 100mm
         print(f"\nMoving {axis}+100mm...")
@@ -61,8 +140,10 @@ class Calibrator:
         else:
             cmd = "N1 G0 Y100.00 F3000"
         
-        await self.sender.websocket.send(cmd)
-        await asyncio.sleep(5)  # Wait for move
+        await self.sender.send_line(cmd)
+        if not await self.sender.wait_for_done(1):
+            print("Move did not complete (timeout)")
+            return
         
         print("\n" + "="*60)
         print("MEASUREMENT")
@@ -71,7 +152,7 @@ class Calibrator:
         print("Measure from the starting position (after homing) to current position.")
         print()
         
-        actual_distance = float(input("Enter actual distance traveled (in mm): "))
+        actual_distance = float(await aio_input("Enter actual distance traveled (in mm): "))
         
         if actual_distance <= 0:
             print("Invalid measurement")
@@ -79,9 +160,10 @@ class Calibrator:
         
         # Calculate new steps/mm
         commanded_distance = 100.0
-        current_steps_per_mm = config.STEPS_PER_MM_X if axis == 'X' else config.STEPS_PER_MM_Y
+        current_steps_per_mm = STEPS_PER_MM_X if axis == 'X' else STEPS_PER_MM_Y
         
-        new_steps_per_mm = current_steps_per_mm * (commanded_distance / actual_distance)
+        ratios = record_measurement(axis, current_steps_per_mm, commanded_distance, actual_distance)
+        new_steps_per_mm = current_steps_per_mm * (sum(ratios) / len(ratios))
         
         print("\n" + "="*60)
         print("CALIBRATION RESULTS")
@@ -92,6 +174,8 @@ class Calibrator:
         print()
         print(f"Current STEPS_PER_MM_{axis}: {current_steps_per_mm}")
         print(f"New STEPS_PER_MM_{axis}: {new_steps_per_mm:.2f}")
+        if len(ratios) > 1:
+            print(f"  (averaged over {len(ratios)} measurements at the current setting)")
         print()
         print("Update config.py with the new value:")
         print(f"  STEPS_PER_MM_{axis} = {new_steps_per_mm:.2f}")
@@ -109,19 +193,22 @@ class Calibrator:
         print('='*60)
         print()
         
-        input("Press Enter to start, or Ctrl-C to cancel...")
+        corners = np.array([0.0, size])
+        if not within_limits(*np.meshgrid(corners, corners)):
+            print(f"❌ {size}mm square exceeds the machine limits / plate")
+            return
+        
+        await aio_input("Press Enter to start, or Ctrl-C to cancel...")
         
         # Generate square commands
         commands = [
-            "N1 G28",  # Home
-            "N2 M3 S60",  # Sauce on (or pen down)
-            f"N3 G1 X0.00 Y0.00 F600",
-            f"N4 G1 X{size:.2f} Y0.00 F600",
-            f"N5 G1 X{size:.2f} Y{size:.2f} F600",
-            f"N6 G1 X0.00 Y{size:.2f} F600",
-            f"N7 G1 X0.00 Y0.00 F600",
-            "N8 M5",  # Sauce off
-            "N9 G0 X0.00 Y0.00 F3000"
+            *PATTERN_PREFIX,
+            "N3 G1 X0.00 Y0.00 F600",
+            G1_LINE(4, size, 0.0, 600),
+            G1_LINE(5, size, size, 600),
+            G1_LINE(6, 0.0, size, 600),
+            "N7 G1 X0.00 Y0.00 F600",
+            *SQUARE_SUFFIX
         ]
         
         print(f"Streaming {len(commands)} commands...")
@@ -149,22 +236,24 @@ class Calibrator:
         print('='*60)
         print()
         
-        input("Press Enter to start, or Ctrl-C to cancel...")
-        
         # Generate circle commands
-        import math
-        commands = ["N1 G28", "N2 M3 S60"]
-        n = 3
+        angles = np.linspace(0.0, 2 * np.pi, segments + 1)
+        xs = radius * np.cos(angles)
+        ys = radius * np.sin(angles)
+        if not within_limits(xs, ys):
+            print(f"❌ Circle of radius {radius}mm exceeds the machine limits / plate")
+            return
         
-        for i in range(segments + 1):
-            angle = (i / segments) * 2 * math.pi
-            x = radius * math.cos(angle)
-            y = radius * math.sin(angle)
-            commands.append(f"N{n} G1 X{x:.2f} Y{y:.2f} F600")
-            n += 1
+        await aio_input("Press Enter to start, or Ctrl-C to cancel...")
+        
+        commands = list(PATTERN_PREFIX)
+        commands.extend(
+            map(G1_LINE, range(3, segments + 4), xs.tolist(), ys.tolist(), repeat(600))
+        )
+        n = segments + 4
         
         commands.append(f"N{n} M5")
-        commands.append(f"N{n+1} G0 X0.00 Y0.00 F3000")
+        commands.append(G0_LINE(n + 1, 0.0, 0.0, 3000))
         
         print(f"Streaming {len(commands)} commands...")
         success = await self.sender.stream_commands(commands)
@@ -177,6 +266,18 @@ class Calibrator:
         else:
             print("\n❌ Test failed")
     
+    @staticmethod
+    def _flow_ladder_commands(line_length: float = 50.0, spacing: float = 15.0):
+        """Yield flow ladder commands one at a time (consumed by the sender window)"""
+        yield "N1 G28"
+        n = 2
+        for i, flow in enumerate(FLOW_LADDER_FLOWS):
+            yield from FLOW_RUNG_TEMPLATE.format(
+                n, n + 1, n + 2, n + 3, y=i * spacing, flow=flow, length=line_length
+            ).split('\n')
+            n += 4
+        yield f"N{n} G0 X0.00 Y0.00 F3000"
+    
     async def test_flow_ladder(self):
         """
         Draw flow calibration ladder
@@ -195,35 +296,11 @@ class Calibrator:
         print("After drawing, measure the line widths to create flow curve.")
         print()
         
-        input("Press Enter to start, or Ctrl-C to cancel...")
-        
-        # Generate ladder commands
-        commands = ["N1 G28"]
-        n = 2
-        
-        flows = [20, 40, 60, 80]
-        line_length = 50.0
-        spacing = 15.0
+        await aio_input("Press Enter to start, or Ctrl-C to cancel...")
         
-        for i, flow in enumerate(flows):
-            y = i * spacing
-            
-            commands.append(f"N{n} G0 X0.00 Y{y:.2f} F3000")
-            n += 1
-            
-            commands.append(f"N{n} M3 S{flow}")
-            n += 1
-            
-            commands.append(f"N{n} G1 X{line_length:.2f} Y{y:.2f} F600")
-            n += 1
-            
-            commands.append(f"N{n} M5")
-            n += 1
-        
-        commands.append(f"N{n} G0 X0.00 Y0.00 F3000")
-        
-        print(f"Streaming {len(commands)} commands...")
-        success = await self.sender.stream_commands(commands)
+        count = 2 + 4 * len(FLOW_LADDER_FLOWS)
+        print(f"Streaming {count} commands...")
+        success = await self.sender.stream_commands(self._flow_ladder_commands(), total=count)
         
         if success:
             print(f"\n✅ Flow ladder complete!")
@@ -251,9 +328,9 @@ async def interactive_menu():
     print()
     
     # Get ESP32 IP
-    ip = input(f"ESP32 IP address [{config.ESP32_IP}]: ").strip()
+    ip = (await aio_input(f"ESP32 IP address [{ESP32_IP}]: ")).strip()
     if not ip:
-        ip = config.ESP32_IP
+        ip = ESP32_IP
     
     # Create calibrator
     cal = Calibrator(esp32_ip=ip)
@@ -280,7 +357,7 @@ async def interactive_menu():
         print("0. Exit")
         print()
         
-        choice = input("Select option: ").strip()
+        choice = (await aio_input("Select option: ")).strip()
         
         try:
             if choice == '1':
@@ -294,8 +371,8 @@ async def interactive_menu():
             elif choice == '5':
                 await cal.test_flow_ladder()
             elif choice == '6':
-                await cal.sender.request_status()
-                await asyncio.sleep(0.5)
+                status = await cal.sender.request_status()
+                print(status or "⏱️  No status response from ESP32")
             elif choice == '0':
                 break
             else:
@@ -313,7 +390,7 @@ async def interactive_menu():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(interactive_menu())
+        run_async(interactive_menu())
     except KeyboardInterrupt:
         print("\n\nExiting...")
         sys.exit(0)
@@ -3,6 +3,8 @@ Configuration for Sriracha Sketcher Motor Control System
 Adjust these values for your specific hardware setup
 """
 
+from typing import Final
+
 # ============================================
 # ESP32 NETWORK CONFIGURATION
 # ============================================
@@ -61,11 +63,28 @@ FLOW_RAMP_TIME_MS = 80    # Time to ramp flow up/down
 # Sliding window (design doc: 32 in-flight commands)
 WINDOW_SIZE = 32
 
+# The sender tunes its in-flight limit between these (AIMD): grow by one
+# per window of clean acks, halve on timeouts. The ceiling caps how many
+# lines are unacknowledged at once (and so the resend burst after a
+# timeout). It does not bound the ESP32 queue: G0/G1 are acked when
+# queued, not when executed, so a full queue answers "busy" at any window.
+MIN_WINDOW_SIZE = 4
+MAX_WINDOW_SIZE = 64
+
+# Several commands may share one newline-separated WebSocket frame.
+# Keep frames within a single TCP segment - the firmware only handles
+# unfragmented frames.
+MAX_FRAME_BYTES = 1024
+
 # Timeout and retry
 ACK_TIMEOUT_SEC = 0.25    # 250ms per design doc
 MAX_RETRIES = 3
 HEARTBEAT_INTERVAL_SEC = 1.0  # 1 second per design doc
 
+# Upper bounds when waiting for the ESP32 to report completion
+MOTION_TIMEOUT_SEC = 30.0   # "done N123" after a queued move
+HOMING_TIMEOUT_SEC = 30.0   # "home_done" after G28
+
 # ============================================
 # PATH OPTIMIZATION
 # ============================================
@@ -119,3 +138,9 @@ LOG_FILE = "plotter.log"
 # Simulation mode (for testing without hardware)
 SIMULATION_MODE = False
 
+# ============================================
+# DERIVED VALUES (computed once - do not edit)
+# ============================================
+# Plate checks compare squared distances (no sqrt per point)
+PLATE_RADIUS_SQ_MM: Final = PLATE_RADIUS_MM * PLATE_RADIUS_MM
+
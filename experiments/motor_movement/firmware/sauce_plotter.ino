@@ -136,6 +136,13 @@ bool sauce_is_on = false;
 
 uint32_t last_acked_seq = 0;
 uint32_t expected_next_seq = 1;  // Track expected sequence for gap detection
+uint32_t active_motion_seq = 0;  // Queued move currently executing (0 = none)
+
+// Range acks: consecutive lines accepted from one frame are acked
+// together as "ok N<lo>..<hi>" when the frame is done
+bool ack_run_open = false;  // True while a frame's lines are being handled
+uint32_t ack_run_lo = 0;
+uint32_t ack_run_hi = 0;    // 0 = no acks pending
 uint32_t last_heartbeat_ms = 0;
 
 // ============================================
@@ -290,10 +297,19 @@ void onWebSocketEvent(AsyncWebSocket *server, AsyncWebSocketClient *client,
     
   } else if (type == WS_EVT_DATA) {
     AwsFrameInfo *info = (AwsFrameInfo*)arg;
-    if (info->final && info->index == 0 && info->len == len && info->opcode == WS_TEXT) {
+    // Host sends text frames, or binary frames of pre-encoded ASCII lines
+    if (info->final && info->index == 0 && info->len == len &&
+        (info->opcode == WS_TEXT || info->opcode == WS_BINARY)) {
       data[len] = 0;
-      String message = (char*)data;
-      handle_message(message);
+      // A frame may carry several newline-separated SSG lines
+      ack_run_open = true;
+      char *line = strtok((char*)data, "\n");
+      while (line != NULL) {
+        handle_message(String(line));
+        line = strtok(NULL, "\n");
+      }
+      ack_run_open = false;
+      flush_acks();
       last_command_ms = millis();
     }
   }
@@ -318,7 +334,7 @@ void handle_message(String message) {
     // Duplicate detection (from retry)
     if (cmd.seq < expected_next_seq) {
       // Already processed - just ack again, don't execute
-      ws.textAll("ok N" + String(cmd.seq));
+      send_ack(cmd.seq);
       return;
     }
     
@@ -348,28 +364,28 @@ void handle_message(String message) {
     if (cmd.cmd_num == 3) {
       // M3 S<duty> - sauce on
       execute_m3(cmd);
-      ws.textAll("ok N" + String(cmd.seq));
+      send_ack(cmd.seq);
       last_acked_seq = cmd.seq;
       return;
       
     } else if (cmd.cmd_num == 5) {
       // M5 - sauce off
       execute_m5(cmd);
-      ws.textAll("ok N" + String(cmd.seq));
+      send_ack(cmd.seq);
       last_acked_seq = cmd.seq;
       return;
       
     } else if (cmd.cmd_num == 114) {
       // M114 - report position
       report_position();
-      ws.textAll("ok N" + String(cmd.seq));
+      send_ack(cmd.seq);
       last_acked_seq = cmd.seq;
       return;
       
     } else if (cmd.cmd_num == 408) {
       // M408 - report status
       send_status();
-      ws.textAll("ok N" + String(cmd.seq));
+      send_ack(cmd.seq);
       last_acked_seq = cmd.seq;
       return;
     }
@@ -377,8 +393,10 @@ void handle_message(String message) {
   
   // G28 - homing (special handling)
   if (cmd.cmd_type == 'G' && cmd.cmd_num == 28) {
+    flush_acks();  // Don't hold earlier acks for the length of homing
     execute_g28();
-    ws.textAll("ok N" + String(cmd.seq));
+    send_ack(cmd.seq);
+    ws.textAll("home_done");  // Homing finished - host can stop waiting
     last_acked_seq = cmd.seq;
     return;
   }
@@ -395,7 +413,7 @@ void handle_message(String message) {
   queue_count++;
   
   // Ack immediately
-  ws.textAll("ok N" + String(cmd.seq));
+  send_ack(cmd.seq);
   last_acked_seq = cmd.seq;
   
   // Start printing if not already
@@ -404,6 +422,37 @@ void handle_message(String message) {
   }
 }
 
+// ============================================
+// ACKS
+// ============================================
+
+void send_ack(uint32_t seq) {
+  if (ack_run_open && seq != 0) {
+    // Extend the current run, or start a new one if seq doesn't follow on
+    if (ack_run_hi != 0 && seq != ack_run_hi + 1) {
+      flush_acks();
+    }
+    if (ack_run_hi == 0) {
+      ack_run_lo = seq;
+    }
+    ack_run_hi = seq;
+    return;
+  }
+  ws.textAll("ok N" + String(seq));
+}
+
+void flush_acks() {
+  if (ack_run_hi == 0) {
+    return;
+  }
+  if (ack_run_lo == ack_run_hi) {
+    ws.textAll("ok N" + String(ack_run_hi));
+  } else {
+    ws.textAll("ok N" + String(ack_run_lo) + ".." + String(ack_run_hi));
+  }
+  ack_run_lo = ack_run_hi = 0;
+}
+
 // ============================================
 // SSG COMMAND PARSER
 // ============================================
@@ -475,16 +524,23 @@ bool parse_ssg_command(String line, SSGCommand &cmd) {
 // ============================================
 
 void execute_next_command() {
-  if (queue_count == 0) {
-    return;
-  }
-  
   // Check if motors are still moving
   if (stepper_X.distanceToGo() != 0 || 
       stepper_Y.distanceToGo() != 0) {
     return;  // Wait for current move to complete
   }
   
+  // Report completion once the queue has drained: "done N<seq>" covers every
+  // move up to <seq>, so a streamed job costs one frame rather than one per move
+  if (active_motion_seq != 0 && queue_count == 0) {
+    ws.textAll("done N" + String(active_motion_seq));
+    active_motion_seq = 0;
+  }
+  
+  if (queue_count == 0) {
+    return;
+  }
+  
   // Get next command
   SSGCommand cmd = command_queue[queue_head];
   queue_head = (queue_head + 1) % QUEUE_SIZE;
@@ -497,6 +553,7 @@ void execute_next_command() {
     } else if (cmd.cmd_num == 1) {
       execute_g1(cmd);  // Linear move
     }
+    active_motion_seq = cmd.seq;
   }
 }
 
@@ -8,16 +8,553 @@ Following Design Doc Section 6.3 (Toolpath Compilation)
 
 import re
 import math
+import os
 import json
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
 from pathlib import Path
-from typing import List, Tuple, Optional
-from xml.etree import ElementTree as ET
+from typing import List, Tuple, Optional, TextIO
 from dataclasses import dataclass
 
+import numpy as np
+
 import config
 
+try:
+    from lxml import etree as ET  # Optional: faster libxml2 parser
+    HAVE_LXML = True
+except ImportError:
+    from xml.etree import ElementTree as ET
+    HAVE_LXML = False
+
+# libxml2 refuses text / attribute values over 10 MB (a long path 'd') by default
+_ITERPARSE_OPTIONS = {'huge_tree': True} if HAVE_LXML else {}
+
+try:
+    from scipy.spatial import cKDTree  # Optional: O(N log N) path ordering
+except ImportError:
+    cKDTree = None
+
+try:
+    from numba import njit  # Optional: compiles the numeric kernels below
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in when numba is not installed"""
+        return lambda func: func
+
+# SVG points tokenizer (compiled once); also the fallback for path numbers
+# written without separators ("0.5.5")
+_NUM_RE = re.compile(r'-?\d*\.?\d+(?:[eE][-+]?\d+)?')
+
+# Every SVG path command letter (S/T are recognized but skipped)
+_PATH_LETTERS = 'MmLlHhVvCcSsQqTtAaZz'
+
+
+def _parse_numbers(text: str, scale: float) -> np.ndarray:
+    """Extract all numbers from an SVG attribute as one scaled float64 array"""
+    try:
+        # Separated numbers (the common case) convert in a single C pass
+        values = np.array(text.replace(',', ' ').split(), dtype=np.float64)
+    except ValueError:
+        # Compact forms like "10-5" or "0.5.5" need the regex tokenizer
+        values = np.array(_NUM_RE.findall(text), dtype=np.float64)
+    values *= scale
+    return values
+
+
+# Path commands understood by _interpret_path: opcode // 2 is the command,
+# odd opcodes are the relative (lowercase) forms
+_PATH_COMMANDS = 'MmLlHhVvCcQqAaZz'
+_PATH_OPCODES = {c: i for i, c in enumerate(_PATH_COMMANDS)}
+_OP_MOVE, _OP_LINE, _OP_HLINE, _OP_VLINE, _OP_CUBIC, _OP_QUAD, _OP_ARC, _OP_CLOSE = range(8)
+
+
+def _tokenize_path(d: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flatten a path 'd' string into command opcodes and one number array
+    
+    Splits with str.replace / str.split rather than a regex scan per
+    command: each command letter starts a NUL-delimited chunk, commas
+    become spaces and a minus sign always starts a number. Only a 'd' with
+    numbers run together ("0.5.5") takes the regex fallback.
+    
+    Returns:
+        (opcodes, offsets, numbers): command i's raw (unscaled) arguments
+        are numbers[offsets[i]:offsets[i + 1]]
+    """
+    spaced = d.replace(',', ' ').replace('-', ' -')
+    for letter in _PATH_LETTERS:
+        if letter in spaced:
+            spaced = spaced.replace(letter, '\0' + letter + ' ')
+    if 'e' in d or 'E' in d:
+        spaced = spaced.replace('e -', 'e-').replace('E -', 'E-')  # Exponents
+    chunks = spaced.split('\0')[1:]  # Text before the first command is ignored
+    
+    opcodes = []
+    offsets = [0]
+    numbers = []
+    for chunk in chunks:
+        op = _PATH_OPCODES.get(chunk[0])
+        if op is None:
+            continue  # S/T shorthand curves are not supported
+        numbers += chunk[2:].split()
+        opcodes.append(op)
+        offsets.append(len(numbers))
+    
+    try:
+        values = np.array(numbers, dtype=np.float64)
+    except ValueError:
+        # Numbers without separators: re-split each command with the regex
+        numbers = []
+        del offsets[1:]
+        for chunk in chunks:
+            if chunk[0] in _PATH_OPCODES:
+                numbers += _NUM_RE.findall(chunk, 2)
+                offsets.append(len(numbers))
+        values = np.array(numbers, dtype=np.float64)
+    
+    return (
+        np.array(opcodes, dtype=np.int8),
+        np.array(offsets, dtype=np.int64),
+        values,
+    )
+
+
+def _pairs_to_vertices(x0: float, y0: float, coords: List[float], relative: bool) -> Tuple[List[float], List[float]]:
+    """Absolute vertices for a run of x,y pairs (relative runs accumulate from x0,y0)"""
+    n = len(coords) // 2 * 2
+    pxs = coords[0:n:2]
+    pys = coords[1:n:2]
+    if relative:
+        return _run_to_vertices(x0, pxs, True), _run_to_vertices(y0, pys, True)
+    return pxs, pys
+
+
+def _run_to_vertices(start: float, values: List[float], relative: bool) -> List[float]:
+    """Absolute values for a coordinate run (sequential cumsum when relative)"""
+    if not relative or not values:
+        return list(values)
+    return np.cumsum([start] + values)[1:].tolist()
+
+
+def _build_path(xs: List[float], ys: List[float], starts_with_move: bool) -> 'Path':
+    """Materialize a subpath's raw coordinate lists as one Path"""
+    moves = np.zeros(len(xs), dtype=bool)
+    moves[0] = starts_with_move
+    return Path(xs, ys, moves)
+
+
+def _ellipse_path(cx: float, cy: float, rx: float, ry: float, segments: int) -> 'Path':
+    """Closed ellipse outline as a Path, all vertices in one vectorized pass"""
+    angles = np.arange(segments + 1) / segments * 2 * np.pi
+    moves = np.zeros(segments + 1, dtype=bool)
+    moves[0] = True
+    return Path(cx + rx * np.cos(angles), cy + ry * np.sin(angles), moves)
+
+
+def _format_draw_run(template: str, first_seq: int, xs: List[float], ys: List[float]) -> str:
+    """
+    Format a run of G1 moves as one newline-terminated block
+    
+    The per-line template is repeated and filled by a single %-format call,
+    so the float formatting runs in C instead of one f-string per line.
+    """
+    seqs = range(first_seq, first_seq + len(xs))
+    return (template * len(xs)) % tuple(chain.from_iterable(zip(seqs, xs, ys)))
+
+
+# Below this many paths the vectorized O(N^2) argmin ordering is faster
+KDTREE_MIN_PATHS = 1000
+
+# Simplify in worker processes only for drawings this large (pool startup
+# costs more than it saves on typical SVGs)
+PARALLEL_SIMPLIFY_MIN_POINTS = 200_000
+
+# Large write buffer for .ssg output (one syscall per ~1 MB of G-code)
+SSG_WRITE_BUFFER = 1 << 20
+
+# Hard cap on Bezier step halvings (2**16 segments) for degenerate input
+MAX_SUBDIVISION_DEPTH = 16
+
+
+@njit(cache=True)
+def _reserve(xs, ys, n, extra):
+    """Grow the vertex buffers (doubling) so extra more vertices fit after n"""
+    if n + extra <= len(xs):
+        return xs, ys
+    cap = max(2 * len(xs), n + extra)
+    grown_x = np.empty(cap)
+    grown_y = np.empty(cap)
+    grown_x[:n] = xs[:n]
+    grown_y[:n] = ys[:n]
+    return grown_x, grown_y
+
+
+@njit(cache=True, inline='always')
+def _afd_emit(ax, bx, cx, dx, ay, by, cy, dy, end_x, end_y, tol, xs, ys, n):
+    """
+    Adaptive forward differencing of a cubic given in power basis
+    
+    Steps t through [0, 1] with a forward-difference table, so each emitted
+    vertex costs three additions per axis. The step h is halved while the
+    chord error bound (|D2| + 2|D3|) / 8 exceeds tol, and doubled again once
+    it drops below tol / 8 (never straight after a halving, so the step
+    cannot oscillate). The table is rebuilt only when h changes.
+    
+    Vertices are written straight into the caller's buffers from index n,
+    so a path's curves share one allocation instead of one array each.
+    
+    Returns:
+        (xs, ys, n): the (possibly grown) buffers and the new vertex count,
+        the vertices after the start point ending at (end_x, end_y)
+    """
+    x = y = d1x = d1y = d2x = d2y = d3x = d3y = 0.0
+    level = 0  # h = 2**-level
+    k = 0      # t = k * h
+    dirty = True
+    refined = False  # No coarsening right after a halving (would oscillate)
+    
+    while k < (1 << level):
+        if dirty:
+            h = 1.0 / (1 << level)
+            t = k * h
+            h2 = h * h
+            h3 = h2 * h
+            x = ((ax * t + bx) * t + cx) * t + dx
+            y = ((ay * t + by) * t + cy) * t + dy
+            d1x = ax * (3 * t * t * h + 3 * t * h2 + h3) + bx * (2 * t * h + h2) + cx * h
+            d1y = ay * (3 * t * t * h + 3 * t * h2 + h3) + by * (2 * t * h + h2) + cy * h
+            d3x = 6 * ax * h3
+            d3y = 6 * ay * h3
+            d2x = (6 * ax * t + 2 * bx) * h2 + d3x
+            d2y = (6 * ay * t + 2 * by) * h2 + d3y
+            dirty = False
+        
+        err = (math.hypot(d2x, d2y) + 2 * math.hypot(d3x, d3y)) / 8
+        if err > tol and level < MAX_SUBDIVISION_DEPTH:
+            level += 1
+            k *= 2
+            dirty = True
+            refined = True
+            continue
+        if err <= tol / 8 and level > 0 and k % 2 == 0 and not refined:
+            level -= 1
+            k //= 2
+            dirty = True
+            continue
+        
+        x += d1x
+        y += d1y
+        d1x += d2x
+        d1y += d2y
+        d2x += d3x
+        d2y += d3y
+        k += 1
+        refined = False
+        if n == len(xs):
+            xs, ys = _reserve(xs, ys, n, 1)
+        xs[n] = x
+        ys[n] = y
+        n += 1
+    
+    # Land exactly on the endpoint (no accumulated rounding)
+    xs[n - 1] = end_x
+    ys[n - 1] = end_y
+    return xs, ys, n
+
+
+@njit(cache=True)
+def _afd_tessellate(ax, bx, cx, dx, ay, by, cy, dy, end_x, end_y, tol) -> np.ndarray:
+    """
+    Adaptive forward differencing of one cubic (see _afd_emit)
+    
+    Returns:
+        (N, 2) array of vertices after the start point, ending at (end_x, end_y)
+    """
+    xs, ys, n = _afd_emit(
+        ax, bx, cx, dx, ay, by, cy, dy, end_x, end_y, tol, np.empty(64), np.empty(64), 0
+    )
+    out = np.empty((n, 2))
+    out[:, 0] = xs[:n]
+    out[:, 1] = ys[:n]
+    return out
+
+
+@njit(cache=True)
+def _arc_segment_count(r, sweep, tol):
+    """Fewest equal angular steps covering sweep radians of radius r within tol"""
+    # Chord error of an angular step on radius r is r * (1 - cos(step / 2))
+    max_step = 2 * math.acos(1 - tol / r) if tol < r else math.pi / 2
+    return max(1, math.ceil(abs(sweep) / max_step))
+
+
+@njit(cache=True)
+def _arc_tessellate(x0, y0, rx, ry, rotation_deg, large_arc, sweep, x1, y1, tol) -> np.ndarray:
+    """
+    Tessellate an SVG elliptical arc, returns (N, 2) array
+    
+    Converts the endpoint form to center form (SVG 1.1 implementation
+    notes F.6.5) and samples just enough angles to stay within tol of the
+    true arc.
+    """
+    if x0 == x1 and y0 == y1:
+        return np.empty((0, 2))  # Spec: arc is omitted
+    rx, ry = abs(rx), abs(ry)
+    if rx == 0 or ry == 0:
+        points = np.empty((1, 2))  # Spec: treated as a straight line
+        points[0, 0] = x1
+        points[0, 1] = y1
+        return points
+    
+    phi = math.radians(rotation_deg % 360)
+    cos_phi, sin_phi = math.cos(phi), math.sin(phi)
+    
+    # Midpoint in the ellipse's rotated frame
+    hx, hy = (x0 - x1) / 2, (y0 - y1) / 2
+    x0p = cos_phi * hx + sin_phi * hy
+    y0p = -sin_phi * hx + cos_phi * hy
+    
+    # Scale radii up if they cannot span the endpoints
+    lam = (x0p / rx)**2 + (y0p / ry)**2
+    if lam > 1:
+        rx, ry = rx * math.sqrt(lam), ry * math.sqrt(lam)
+    
+    num = (rx * ry)**2 - (rx * y0p)**2 - (ry * x0p)**2
+    den = (rx * y0p)**2 + (ry * x0p)**2
+    coef = math.sqrt(max(0.0, num / den))
+    if large_arc == sweep:
+        coef = -coef
+    cxp = coef * rx * y0p / ry
+    cyp = -coef * ry * x0p / rx
+    cx = cos_phi * cxp - sin_phi * cyp + (x0 + x1) / 2
+    cy = sin_phi * cxp + cos_phi * cyp + (y0 + y1) / 2
+    
+    theta = math.atan2((y0p - cyp) / ry, (x0p - cxp) / rx)
+    delta = math.atan2((-y0p - cyp) / ry, (-x0p - cxp) / rx) - theta
+    if sweep and delta < 0:
+        delta += 2 * math.pi
+    elif not sweep and delta > 0:
+        delta -= 2 * math.pi
+    
+    segments = _arc_segment_count(max(rx, ry), delta, tol)
+    
+    angles = theta + delta * np.arange(1, segments + 1) / segments
+    ex = rx * np.cos(angles)
+    ey = ry * np.sin(angles)
+    points = np.empty((segments, 2))
+    points[:, 0] = cos_phi * ex - sin_phi * ey + cx
+    points[:, 1] = sin_phi * ex + cos_phi * ey + cy
+    points[-1, 0] = x1  # Land exactly on the endpoint
+    points[-1, 1] = y1
+    return points
+
+
+@njit(cache=True)
+def _interpret_path(opcodes, offsets, numbers, scale, tol):
+    """
+    Run a tokenized SVG path, emitting every vertex into flat buffers
+    
+    Same semantics as SSGCompiler._parse_path (which stays as the
+    pure-Python path when numba is not installed), but with the current
+    point held in locals and curves / arcs tessellated in-kernel.
+    
+    Returns:
+        (xs, ys, bounds, moves): subpath k is xs[bounds[k]:bounds[k + 1]],
+        moves[k] is True when it starts with a move
+    """
+    xs = np.empty(64 + len(numbers))
+    ys = np.empty(64 + len(numbers))
+    n = 0
+    bounds = np.empty(len(opcodes) + 2, dtype=np.int64)
+    moves = np.empty(len(opcodes) + 1, dtype=np.bool_)
+    n_paths = 0
+    path_begin = 0
+    starts_with_move = False
+    current_x = current_y = 0.0
+    path_start_x = path_start_y = 0.0
+    
+    for c in range(len(opcodes)):
+        op = opcodes[c] >> 1
+        relative = (opcodes[c] & 1) == 1
+        lo = offsets[c]
+        hi = offsets[c + 1]
+        
+        # Move: close off the current subpath, then implicit lineto pairs
+        if op == _OP_MOVE:
+            if hi - lo < 2:
+                continue
+            if n > path_begin:
+                bounds[n_paths] = path_begin
+                moves[n_paths] = starts_with_move
+                n_paths += 1
+                path_begin = n
+            if relative:
+                current_x += numbers[lo] * scale
+                current_y += numbers[lo + 1] * scale
+            else:
+                current_x = numbers[lo] * scale
+                current_y = numbers[lo + 1] * scale
+            path_start_x, path_start_y = current_x, current_y
+            starts_with_move = True
+            xs, ys = _reserve(xs, ys, n, 1)
+            xs[n] = current_x
+            ys[n] = current_y
+            n += 1
+            lo += 2
+            op = _OP_LINE
+        
+        if op == _OP_LINE:
+            xs, ys = _reserve(xs, ys, n, (hi - lo) // 2)
+            for i in range(lo, hi - 1, 2):
+                if relative:
+                    current_x += numbers[i] * scale
+                    current_y += numbers[i + 1] * scale
+                else:
+                    current_x = numbers[i] * scale
+                    current_y = numbers[i + 1] * scale
+                xs[n] = current_x
+                ys[n] = current_y
+                n += 1
+        
+        elif op == _OP_HLINE or op == _OP_VLINE:
+            xs, ys = _reserve(xs, ys, n, hi - lo)
+            for i in range(lo, hi):
+                if op == _OP_HLINE:
+                    current_x = current_x + numbers[i] * scale if relative else numbers[i] * scale
+                else:
+                    current_y = current_y + numbers[i] * scale if relative else numbers[i] * scale
+                xs[n] = current_x
+                ys[n] = current_y
+                n += 1
+        
+        elif op == _OP_CUBIC or op == _OP_QUAD:
+            step = 6 if op == _OP_CUBIC else 4
+            for i in range(lo, hi - step + 1, step):
+                ox = current_x if relative else 0.0
+                oy = current_y if relative else 0.0
+                x1 = ox + numbers[i] * scale
+                y1 = oy + numbers[i + 1] * scale
+                x2 = ox + numbers[i + 2] * scale
+                y2 = oy + numbers[i + 3] * scale
+                x0, y0 = current_x, current_y
+                if op == _OP_CUBIC:
+                    x = ox + numbers[i + 4] * scale
+                    y = oy + numbers[i + 5] * scale
+                    xs, ys, n = _afd_emit(
+                        x - x0 + 3 * (x1 - x2), 3 * (x2 - 2 * x1 + x0), 3 * (x1 - x0), x0,
+                        y - y0 + 3 * (y1 - y2), 3 * (y2 - 2 * y1 + y0), 3 * (y1 - y0), y0,
+                        x, y, tol, xs, ys, n,
+                    )
+                else:
+                    x, y = x2, y2
+                    xs, ys, n = _afd_emit(
+                        0.0, x - 2 * x1 + x0, 2 * (x1 - x0), x0,
+                        0.0, y - 2 * y1 + y0, 2 * (y1 - y0), y0,
+                        x, y, tol, xs, ys, n,
+                    )
+                current_x, current_y = x, y
+        
+        # Elliptical arc: rotation and flags are not lengths, so stay unscaled
+        elif op == _OP_ARC:
+            for i in range(lo, hi - 6, 7):
+                x = numbers[i + 5] * scale
+                y = numbers[i + 6] * scale
+                if relative:
+                    x += current_x
+                    y += current_y
+                points = _arc_tessellate(
+                    current_x, current_y, numbers[i] * scale, numbers[i + 1] * scale,
+                    numbers[i + 2], numbers[i + 3] != 0, numbers[i + 4] != 0, x, y, tol,
+                )
+                xs, ys = _reserve(xs, ys, n, len(points))
+                xs[n:n + len(points)] = points[:, 0]
+                ys[n:n + len(points)] = points[:, 1]
+                n += len(points)
+                current_x, current_y = x, y
+        
+        elif op == _OP_CLOSE:
+            if n > path_begin:
+                xs, ys = _reserve(xs, ys, n, 1)
+                xs[n] = path_start_x
+                ys[n] = path_start_y
+                n += 1
+                current_x, current_y = path_start_x, path_start_y
+    
+    if n > path_begin:
+        bounds[n_paths] = path_begin
+        moves[n_paths] = starts_with_move
+        n_paths += 1
+    bounds[n_paths] = n
+    return xs[:n], ys[:n], bounds[:n_paths + 1], moves[:n_paths]
+
+
+@njit(cache=True)
+def _douglas_peucker_mask(xs, ys, epsilon):
+    """
+    Iterative Douglas-Peucker (explicit stack) returning a keep-mask
+    
+    The farthest-point search is vectorized over each span and compares
+    squared distances. A span whose chord is short is dropped without the
+    distance scan once its polyline length is confirmed under 2 * epsilon:
+    no interior point can then be farther than epsilon from both endpoints,
+    hence from the chord. (Chord length alone is not enough - closed loops
+    have a zero-length chord.)
+    """
+    n = len(xs)
+    keep = np.zeros(n, dtype=np.bool_)
+    keep[0] = keep[-1] = True
+    eps_sq = epsilon * epsilon
+    max_arc = 2.0 * epsilon
+    max_arc_sq = max_arc * max_arc
+    
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        
+        dx = xs[j] - xs[i]
+        dy = ys[j] - ys[i]
+        seg_sq = dx * dx + dy * dy
+        m = (i + j) // 2
+        if j - i > 32 and seg_sq < max_arc_sq and (math.hypot(xs[m] - xs[i], ys[m] - ys[i]) +
+                                    math.hypot(xs[j] - xs[m], ys[j] - ys[m])) < max_arc:
+            # Long span, short chord (and via midpoint): skip the scan if the whole span is short too
+            span_x = xs[i+1:j+1] - xs[i:j]
+            span_y = ys[i+1:j+1] - ys[i:j]
+            if np.sum(np.sqrt(span_x * span_x + span_y * span_y)) < max_arc:
+                continue
+        
+        # Squared distance from interior points to segment i-j
+        px = xs[i+1:j] - xs[i]
+        py = ys[i+1:j] - ys[i]
+        if seg_sq == 0:
+            d_sq = px * px + py * py
+        else:
+            t = np.clip((px * dx + py * dy) / seg_sq, 0.0, 1.0)
+            ex = px - t * dx
+            ey = py - t * dy
+            d_sq = ex * ex + ey * ey
+        
+        k = int(np.argmax(d_sq))
+        if d_sq[k] > eps_sq:
+            index = i + 1 + k
+            keep[index] = True
+            stack.append((i, index))
+            stack.append((index, j))
+    
+    return keep
+
 
-@dataclass
+def _simplify_chunk(chunk: List[Tuple[np.ndarray, np.ndarray]], epsilon: float) -> List[np.ndarray]:
+    """Process-pool worker: Douglas-Peucker keep-masks for a chunk of paths"""
+    return [_douglas_peucker_mask(xs, ys, epsilon) for xs, ys in chunk]
+
+
+@dataclass(slots=True)
 class Point:
     """2D point with metadata"""
     x: float
@@ -25,19 +562,45 @@ class Point:
     is_move: bool = False  # True for G0 (rapid), False for G1 (draw)
 
 
-@dataclass
 class Path:
-    """Collection of connected points forming a path"""
-    points: List[Point]
+    """
+    Collection of connected points forming a path
+    
+    Stored as parallel arrays (structure-of-arrays) so whole-path math runs
+    as NumPy vector ops instead of per-Point Python loops.
+    """
+    __slots__ = ('xs', 'ys', 'moves')
+    
+    def __init__(self, xs, ys, moves=None):
+        self.xs = np.asarray(xs, dtype=float)
+        self.ys = np.asarray(ys, dtype=float)
+        if moves is None:
+            moves = np.zeros(len(self.xs), dtype=bool)
+        self.moves = np.asarray(moves, dtype=bool)  # True for G0 (rapid)
+    
+    @classmethod
+    def from_points(cls, points: List[Point]) -> 'Path':
+        """Build a path from a list of Points (one conversion per path)"""
+        return cls(
+            [p.x for p in points],
+            [p.y for p in points],
+            [p.is_move for p in points],
+        )
+    
+    def __len__(self) -> int:
+        return len(self.xs)
+    
+    @property
+    def points(self) -> List[Point]:
+        """Per-point view, built on demand (prefer xs/ys in hot code)"""
+        return [
+            Point(x, y, is_move=m)
+            for x, y, m in zip(self.xs.tolist(), self.ys.tolist(), self.moves.tolist())
+        ]
     
     def length(self) -> float:
         """Calculate total path length in mm"""
-        total = 0.0
-        for i in range(1, len(self.points)):
-            dx = self.points[i].x - self.points[i-1].x
-            dy = self.points[i].y - self.points[i-1].y
-            total += math.sqrt(dx*dx + dy*dy)
-        return total
+        return float(np.hypot(np.diff(self.xs), np.diff(self.ys)).sum())
 
 
 class SSGCompiler:
@@ -46,7 +609,23 @@ class SSGCompiler:
     def __init__(self):
         self.paths: List[Path] = []
         self.ssg_lines: List[str] = []
+        self.num_commands = 0
+        self.num_rapid = 0
+        self.num_draw = 0
         self.warnings: List[str] = []
+        self._total_length: Optional[float] = None  # Cached, reset when geometry changes
+        self._vertices: Optional[np.ndarray] = None  # Cached, reset when geometry changes
+        
+        # SVG element tag -> parser(element, scale), one dict lookup per element
+        self._element_parsers = {
+            'path': lambda element, scale: self._parse_path(element.get('d', ''), scale),
+            'line': self._parse_line,
+            'rect': self._parse_rect,
+            'circle': self._parse_circle,
+            'ellipse': self._parse_ellipse,
+            'polyline': lambda element, scale: self._parse_polyline(element, scale, close=False),
+            'polygon': lambda element, scale: self._parse_polyline(element, scale, close=True),
+        }
         
     def load_svg(self, filepath: str, scale: float = 1.0) -> None:
         """
@@ -57,109 +636,81 @@ class SSGCompiler:
             scale: Scaling factor (1.0 = 1 SVG unit = 1mm)
         """
         print(f"Loading SVG: {filepath}")
-        tree = ET.parse(filepath)
-        root = tree.getroot()
         
-        # Parse all drawing elements
-        for element in root.iter():
-            tag = element.tag.split('}')[-1]  # Remove XML namespace
+        # Stream elements and clear each once handled, so the whole DOM
+        # (embedded images, metadata) is never held in memory
+        parsers = self._element_parsers
+        for _, element in ET.iterparse(filepath, events=('end',), **_ITERPARSE_OPTIONS):
+            tag = element.tag
+            if not isinstance(tag, str):
+                continue  # Comment / processing instruction (lxml)
+            tag = tag.split('}')[-1]  # Remove XML namespace
+            
+            parser = parsers.get(tag)
+            if parser is not None:
+                parser(element, scale)
             
-            if tag == 'path':
-                self._parse_path(element.get('d', ''), scale)
-            elif tag == 'line':
-                self._parse_line(element, scale)
-            elif tag == 'rect':
-                self._parse_rect(element, scale)
-            elif tag == 'circle':
-                self._parse_circle(element, scale)
-            elif tag == 'ellipse':
-                self._parse_ellipse(element, scale)
-            elif tag == 'polyline':
-                self._parse_polyline(element, scale, close=False)
-            elif tag == 'polygon':
-                self._parse_polyline(element, scale, close=True)
-        
-        print(f"Parsed {len(self.paths)} paths with {sum(len(p.points) for p in self.paths)} points")
+            element.clear()
+            if HAVE_LXML:
+                # Detach the emptied siblings too, or the parent keeps them all
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+        
+        self._total_length = None
+        self._vertices = None
+        print(f"Parsed {len(self.paths)} paths with {sum(len(p) for p in self.paths)} points")
         
     def _parse_path(self, d: str, scale: float) -> None:
         """Parse SVG path 'd' attribute"""
-        commands = re.findall(r'[MmLlHhVvCcSsQqTtAaZz][^MmLlHhVvCcSsQqTtAaZz]*', d)
+        if HAVE_NUMBA:
+            self._parse_path_compiled(d, scale)
+            return
+        
+        opcodes, offsets, numbers = _tokenize_path(d)
+        scaled = (numbers * scale).tolist()
         
-        current_path = Path(points=[])
+        # Raw coordinates of the current subpath (one Path built per subpath)
+        xs: List[float] = []
+        ys: List[float] = []
+        starts_with_move = False
         current_x, current_y = 0.0, 0.0
         path_start_x, path_start_y = 0.0, 0.0
         
-        for cmd in commands:
-            cmd_type = cmd[0]
-            coords_str = cmd[1:].strip()
-            
-            if not coords_str and cmd_type not in 'Zz':
-                coords = []
-            else:
-                coords = [float(x) * scale for x in re.findall(r'-?\d*\.?\d+', coords_str)]
-            
-            # Move commands
-            if cmd_type == 'M':  # Absolute move
-                if current_path.points:
-                    self.paths.append(current_path)
-                    current_path = Path(points=[])
-                current_x = coords[0]
-                current_y = coords[1]
-                path_start_x, path_start_y = current_x, current_y
-                current_path.points.append(Point(current_x, current_y, is_move=True))
-                
-                # Subsequent coordinate pairs are implicit lineto
-                for i in range(2, len(coords), 2):
-                    current_x = coords[i]
-                    current_y = coords[i+1]
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
+        for op, lo, hi in zip(opcodes.tolist(), offsets[:-1].tolist(), offsets[1:].tolist()):
+            cmd_type = _PATH_COMMANDS[op]
+            coords = scaled[lo:hi]
             
-            elif cmd_type == 'm':  # Relative move
-                if current_path.points:
-                    self.paths.append(current_path)
-                    current_path = Path(points=[])
-                current_x += coords[0]
-                current_y += coords[1]
+            # Move commands (subsequent coordinate pairs are implicit lineto)
+            if cmd_type in 'Mm':
+                if xs:
+                    self.paths.append(_build_path(xs, ys, starts_with_move))
+                if cmd_type == 'M':  # Absolute move
+                    current_x, current_y = coords[0], coords[1]
+                else:  # Relative move
+                    current_x += coords[0]
+                    current_y += coords[1]
                 path_start_x, path_start_y = current_x, current_y
-                current_path.points.append(Point(current_x, current_y, is_move=True))
+                starts_with_move = True
                 
-                for i in range(2, len(coords), 2):
-                    current_x += coords[i]
-                    current_y += coords[i+1]
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
+                line_xs, line_ys = _pairs_to_vertices(current_x, current_y, coords[2:], cmd_type == 'm')
+                xs = [current_x] + line_xs
+                ys = [current_y] + line_ys
             
             # Line commands
-            elif cmd_type == 'L':  # Absolute line
-                for i in range(0, len(coords), 2):
-                    current_x = coords[i]
-                    current_y = coords[i+1]
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
-            
-            elif cmd_type == 'l':  # Relative line
-                for i in range(0, len(coords), 2):
-                    current_x += coords[i]
-                    current_y += coords[i+1]
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
-            
-            elif cmd_type == 'H':  # Horizontal line (absolute)
-                for x in coords:
-                    current_x = x
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
+            elif cmd_type in 'Ll':
+                line_xs, line_ys = _pairs_to_vertices(current_x, current_y, coords, cmd_type == 'l')
+                xs += line_xs
+                ys += line_ys
             
-            elif cmd_type == 'h':  # Horizontal line (relative)
-                for x in coords:
-                    current_x += x
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
+            elif cmd_type in 'Hh':  # Horizontal line
+                line_xs = _run_to_vertices(current_x, coords, cmd_type == 'h')
+                xs += line_xs
+                ys += [current_y] * len(line_xs)
             
-            elif cmd_type == 'V':  # Vertical line (absolute)
-                for y in coords:
-                    current_y = y
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
-            
-            elif cmd_type == 'v':  # Vertical line (relative)
-                for y in coords:
-                    current_y += y
-                    current_path.points.append(Point(current_x, current_y, is_move=False))
+            elif cmd_type in 'Vv':  # Vertical line
+                line_ys = _run_to_vertices(current_y, coords, cmd_type == 'v')
+                xs += [current_x] * len(line_ys)
+                ys += line_ys
             
             # Cubic Bezier
             elif cmd_type in 'Cc':
@@ -180,8 +731,8 @@ class SSGCompiler:
                     bezier_points = self._tessellate_cubic_bezier(
                         current_x, current_y, x1, y1, x2, y2, x, y
                     )
-                    for bx, by in bezier_points:
-                        current_path.points.append(Point(bx, by, is_move=False))
+                    xs += bezier_points[:, 0].tolist()
+                    ys += bezier_points[:, 1].tolist()
                     current_x, current_y = x, y
             
             # Quadratic Bezier
@@ -200,83 +751,80 @@ class SSGCompiler:
                     bezier_points = self._tessellate_quadratic_bezier(
                         current_x, current_y, x1, y1, x, y
                     )
-                    for bx, by in bezier_points:
-                        current_path.points.append(Point(bx, by, is_move=False))
+                    xs += bezier_points[:, 0].tolist()
+                    ys += bezier_points[:, 1].tolist()
                     current_x, current_y = x, y
             
-            # Arc (simplified to line segments)
+            # Elliptical arc: rx ry x-axis-rotation large-arc-flag sweep-flag x y
             elif cmd_type in 'Aa':
-                for i in range(0, len(coords), 7):
+                # Rotation and flags are not lengths, so re-read them unscaled
+                raw = numbers[lo:hi].tolist()
+                for i in range(0, len(raw) - 6, 7):
+                    rx, ry = raw[i] * scale, raw[i+1] * scale
                     if cmd_type == 'A':
                         x, y = coords[i+5], coords[i+6]
                     else:
                         x = current_x + coords[i+5]
                         y = current_y + coords[i+6]
                     
-                    # Simple linear approximation (TODO: proper arc tessellation)
-                    arc_points = self._tessellate_arc(current_x, current_y, x, y, segments=20)
-                    for ax, ay in arc_points:
-                        current_path.points.append(Point(ax, ay, is_move=False))
+                    arc_points = self._tessellate_arc(
+                        current_x, current_y, rx, ry, raw[i+2],
+                        raw[i+3] != 0, raw[i+4] != 0, x, y
+                    )
+                    xs += arc_points[:, 0].tolist()
+                    ys += arc_points[:, 1].tolist()
                     current_x, current_y = x, y
             
             # Close path
             elif cmd_type in 'Zz':
-                if current_path.points:
+                if xs:
                     # Close back to start
-                    current_path.points.append(Point(path_start_x, path_start_y, is_move=False))
+                    xs.append(path_start_x)
+                    ys.append(path_start_y)
                     current_x, current_y = path_start_x, path_start_y
+            
+            # Track the pen after line-type commands
+            if cmd_type in 'MmLlHhVv' and xs:
+                current_x, current_y = xs[-1], ys[-1]
         
         # Add final path
-        if current_path.points:
-            self.paths.append(current_path)
-    
-    def _tessellate_cubic_bezier(self, x0, y0, x1, y1, x2, y2, x3, y3) -> List[Tuple[float, float]]:
-        """Adaptive tessellation of cubic Bezier curve"""
-        points = []
-        segments = self._estimate_bezier_segments(x0, y0, x1, y1, x2, y2, x3, y3)
-        
-        for i in range(1, segments + 1):
-            t = i / segments
-            mt = 1 - t
-            x = mt**3 * x0 + 3 * mt**2 * t * x1 + 3 * mt * t**2 * x2 + t**3 * x3
-            y = mt**3 * y0 + 3 * mt**2 * t * y1 + 3 * mt * t**2 * y2 + t**3 * y3
-            points.append((x, y))
-        return points
+        if xs:
+            self.paths.append(_build_path(xs, ys, starts_with_move))
     
-    def _tessellate_quadratic_bezier(self, x0, y0, x1, y1, x2, y2) -> List[Tuple[float, float]]:
-        """Adaptive tessellation of quadratic Bezier curve"""
-        points = []
-        segments = max(10, int(math.sqrt((x2-x0)**2 + (y2-y0)**2) / config.BEZIER_MAX_ERROR_MM))
-        
-        for i in range(1, segments + 1):
-            t = i / segments
-            mt = 1 - t
-            x = mt**2 * x0 + 2 * mt * t * x1 + t**2 * x2
-            y = mt**2 * y0 + 2 * mt * t * y1 + t**2 * y2
-            points.append((x, y))
-        return points
+    def _parse_path_compiled(self, d: str, scale: float) -> None:
+        """Parse SVG path 'd' attribute with the numba path interpreter"""
+        xs, ys, bounds, moves = _interpret_path(
+            *_tokenize_path(d), scale, config.BEZIER_MAX_ERROR_MM
+        )
+        for k in range(len(moves)):
+            lo, hi = bounds[k], bounds[k + 1]
+            path_moves = np.zeros(hi - lo, dtype=bool)
+            path_moves[0] = moves[k]
+            self.paths.append(Path(xs[lo:hi], ys[lo:hi], path_moves))
     
-    def _tessellate_arc(self, x0, y0, x1, y1, segments: int = 20) -> List[Tuple[float, float]]:
-        """Simple linear arc approximation (placeholder)"""
-        points = []
-        for i in range(1, segments + 1):
-            t = i / segments
-            x = x0 + (x1 - x0) * t
-            y = y0 + (y1 - y0) * t
-            points.append((x, y))
-        return points
+    def _tessellate_cubic_bezier(self, x0, y0, x1, y1, x2, y2, x3, y3) -> np.ndarray:
+        """Adaptive tessellation of cubic Bezier curve, returns (N, 2) array"""
+        # Power basis: B(t) = ((a*t + b)*t + c)*t + d
+        return _afd_tessellate(
+            x3 - x0 + 3 * (x1 - x2), 3 * (x2 - 2 * x1 + x0), 3 * (x1 - x0), x0,
+            y3 - y0 + 3 * (y1 - y2), 3 * (y2 - 2 * y1 + y0), 3 * (y1 - y0), y0,
+            x3, y3, config.BEZIER_MAX_ERROR_MM,
+        )
+    
+    def _tessellate_quadratic_bezier(self, x0, y0, x1, y1, x2, y2) -> np.ndarray:
+        """Adaptive tessellation of quadratic Bezier curve, returns (N, 2) array"""
+        return _afd_tessellate(
+            0.0, x2 - 2 * x1 + x0, 2 * (x1 - x0), x0,
+            0.0, y2 - 2 * y1 + y0, 2 * (y1 - y0), y0,
+            x2, y2, config.BEZIER_MAX_ERROR_MM,
+        )
     
-    def _estimate_bezier_segments(self, x0, y0, x1, y1, x2, y2, x3, y3) -> int:
-        """Estimate number of segments needed for bezier curve"""
-        # Use chord length heuristic
-        chord = math.sqrt((x3-x0)**2 + (y3-y0)**2)
-        control_length = (
-            math.sqrt((x1-x0)**2 + (y1-y0)**2) +
-            math.sqrt((x2-x1)**2 + (y2-y1)**2) +
-            math.sqrt((x3-x2)**2 + (y3-y2)**2)
+    def _tessellate_arc(self, x0, y0, rx, ry, rotation_deg, large_arc, sweep, x1, y1) -> np.ndarray:
+        """Tessellate an SVG elliptical arc, returns (N, 2) array"""
+        return _arc_tessellate(
+            x0, y0, rx, ry, rotation_deg, large_arc, sweep, x1, y1,
+            config.BEZIER_MAX_ERROR_MM,
         )
-        segments = max(10, int(control_length / config.BEZIER_MAX_ERROR_MM))
-        return min(segments, 100)  # Cap at 100 segments
     
     def _parse_line(self, element, scale: float) -> None:
         """Parse SVG line element"""
@@ -284,10 +832,7 @@ class SSGCompiler:
         y1 = float(element.get('y1', 0)) * scale
         x2 = float(element.get('x2', 0)) * scale
         y2 = float(element.get('y2', 0)) * scale
-        self.paths.append(Path(points=[
-            Point(x1, y1, is_move=True),
-            Point(x2, y2, is_move=False)
-        ]))
+        self.paths.append(_build_path([x1, x2], [y1, y2], True))
     
     def _parse_rect(self, element, scale: float) -> None:
         """Parse SVG rectangle element"""
@@ -295,56 +840,69 @@ class SSGCompiler:
         y = float(element.get('y', 0)) * scale
         w = float(element.get('width', 0)) * scale
         h = float(element.get('height', 0)) * scale
-        self.paths.append(Path(points=[
-            Point(x, y, is_move=True),
-            Point(x + w, y, is_move=False),
-            Point(x + w, y + h, is_move=False),
-            Point(x, y + h, is_move=False),
-            Point(x, y, is_move=False)
-        ]))
-    
-    def _parse_circle(self, element, scale: float, segments: int = 36) -> None:
-        """Parse SVG circle element"""
+        self.paths.append(_build_path(
+            [x, x + w, x + w, x, x],
+            [y, y, y + h, y + h, y],
+            True,
+        ))
+    
+    def _parse_circle(self, element, scale: float, segments: Optional[int] = None) -> None:
+        """Parse SVG circle element (segments=None sizes the outline to its radius)"""
         cx = float(element.get('cx', 0)) * scale
         cy = float(element.get('cy', 0)) * scale
         r = float(element.get('r', 0)) * scale
-        points = []
-        for i in range(segments + 1):
-            angle = (i / segments) * 2 * math.pi
-            x = cx + r * math.cos(angle)
-            y = cy + r * math.sin(angle)
-            points.append(Point(x, y, is_move=(i == 0)))
-        self.paths.append(Path(points=points))
-    
-    def _parse_ellipse(self, element, scale: float, segments: int = 36) -> None:
-        """Parse SVG ellipse element"""
+        if segments is None:
+            segments = _arc_segment_count(abs(r), 2 * math.pi, config.BEZIER_MAX_ERROR_MM)
+        self.paths.append(_ellipse_path(cx, cy, r, r, segments))
+    
+    def _parse_ellipse(self, element, scale: float, segments: Optional[int] = None) -> None:
+        """Parse SVG ellipse element (segments=None sizes the outline to its radii)"""
         cx = float(element.get('cx', 0)) * scale
         cy = float(element.get('cy', 0)) * scale
         rx = float(element.get('rx', 0)) * scale
         ry = float(element.get('ry', 0)) * scale
-        points = []
-        for i in range(segments + 1):
-            angle = (i / segments) * 2 * math.pi
-            x = cx + rx * math.cos(angle)
-            y = cy + ry * math.sin(angle)
-            points.append(Point(x, y, is_move=(i == 0)))
-        self.paths.append(Path(points=points))
+        if segments is None:
+            segments = _arc_segment_count(max(abs(rx), abs(ry)), 2 * math.pi, config.BEZIER_MAX_ERROR_MM)
+        self.paths.append(_ellipse_path(cx, cy, rx, ry, segments))
     
     def _parse_polyline(self, element, scale: float, close: bool = False) -> None:
         """Parse SVG polyline/polygon element"""
         points_str = element.get('points', '')
-        coords = [float(x) * scale for x in re.findall(r'-?\d*\.?\d+', points_str)]
+        coords = _parse_numbers(points_str, scale)
         if len(coords) < 2:
             return
         
-        points = [Point(coords[0], coords[1], is_move=True)]
-        for i in range(2, len(coords), 2):
-            points.append(Point(coords[i], coords[i+1], is_move=False))
+        # Vertex arrays straight from the flat coordinate array (no per-Point objects)
+        pts = coords[:len(coords) // 2 * 2].reshape(-1, 2)
+        if close and len(pts) >= 2:
+            pts = np.vstack((pts, pts[:1]))
         
-        if close and len(coords) >= 4:
-            points.append(Point(coords[0], coords[1], is_move=False))
+        xs, ys = np.ascontiguousarray(pts.T)
+        self.paths.append(_build_path(xs, ys, True))
+    
+    def total_length(self) -> float:
+        """Total path length in mm (computed once per geometry change)"""
+        if self._total_length is None:
+            self._total_length = sum(p.length() for p in self.paths)
+        return self._total_length
+    
+    def vertices(self) -> np.ndarray:
+        """
+        Every path vertex as one (N, 2) float32 array, in path order
         
-        self.paths.append(Path(points=points))
+        Built once per geometry change; float32 is ample for mm-scale
+        plate coordinates and halves the buffer.
+        """
+        if self._vertices is None:
+            out = np.empty((sum(len(path) for path in self.paths), 2), dtype=np.float32)
+            i = 0
+            for path in self.paths:
+                j = i + len(path)
+                out[i:j, 0] = path.xs
+                out[i:j, 1] = path.ys
+                i = j
+            self._vertices = out
+        return self._vertices
     
     def normalize(self) -> None:
         """
@@ -353,15 +911,18 @@ class SSGCompiler:
         """
         print("Normalizing paths...")
         
-        # Find bounds
-        all_x = [p.x for path in self.paths for p in path.points]
-        all_y = [p.y for path in self.paths for p in path.points]
-        
-        if not all_x:
+        if not self.paths:
             return
         
-        min_x, max_x = min(all_x), max(all_x)
-        min_y, max_y = min(all_y), max(all_y)
+        # Gather every vertex into one buffer: bounds, centering, the plate
+        # check and total length are then one vectorized pass each
+        all_x = np.concatenate([path.xs for path in self.paths])
+        all_y = np.concatenate([path.ys for path in self.paths])
+        splits = np.cumsum([len(path) for path in self.paths])[:-1]
+        
+        # Find bounds
+        min_x, max_x = all_x.min(), all_x.max()
+        min_y, max_y = all_y.min(), all_y.max()
         width = max_x - min_x
         height = max_y - min_y
         
@@ -371,29 +932,36 @@ class SSGCompiler:
         offset_x = -(min_x + max_x) / 2
         offset_y = -(min_y + max_y) / 2
         
-        for path in self.paths:
-            for point in path.points:
-                point.x += offset_x
-                point.y += offset_y
-        
-        # Validate against plate radius
-        for path in self.paths:
-            for point in path.points:
-                dist = math.sqrt(point.x**2 + point.y**2)
-                if dist > config.PLATE_RADIUS_MM:
-                    self.warnings.append(
-                        f"Point ({point.x:.1f}, {point.y:.1f}) outside plate radius {config.PLATE_RADIUS_MM}mm"
-                    )
+        all_x += offset_x
+        all_y += offset_y
+        
+        # Paths become views into the shifted buffer (no second shift pass)
+        for path, xs, ys in zip(self.paths, np.split(all_x, splits), np.split(all_y, splits)):
+            path.xs = xs
+            path.ys = ys
+        
+        # Validate against plate radius (strings only for offending points)
+        outside = np.flatnonzero(all_x * all_x + all_y * all_y > config.PLATE_RADIUS_SQ_MM)
+        for x, y in zip(all_x[outside].tolist(), all_y[outside].tolist()):
+            self.warnings.append(
+                f"Point ({x:.1f}, {y:.1f}) outside plate radius {config.PLATE_RADIUS_MM}mm"
+            )
         
         # Validate constraints (Design Doc 7.1)
         if len(self.paths) > config.MAX_PATHS:
             self.warnings.append(f"Too many paths: {len(self.paths)} > {config.MAX_PATHS}")
         
-        total_length = sum(p.length() for p in self.paths)
+        # Total length over the shared buffer, minus the jumps between paths
+        segments = np.hypot(np.diff(all_x), np.diff(all_y))
+        jumps = splits[(splits > 0) & (splits < len(all_x))] - 1
+        segments[jumps] = 0.0
+        total_length = float(segments.sum())
+        self._total_length = total_length
+        self._vertices = None
         if total_length > config.MAX_TOTAL_LENGTH_MM:
             self.warnings.append(f"Total length too long: {total_length:.1f}mm > {config.MAX_TOTAL_LENGTH_MM}mm")
         
-        total_vertices = sum(len(p.points) for p in self.paths)
+        total_vertices = len(all_x)
         if total_vertices > config.MAX_VERTICES:
             self.warnings.append(f"Too many vertices: {total_vertices} > {config.MAX_VERTICES}")
         
@@ -405,53 +973,57 @@ class SSGCompiler:
         Remove redundant points while preserving shape
         """
         print("Simplifying paths...")
-        original_count = sum(len(p.points) for p in self.paths)
+        original_count = sum(len(p) for p in self.paths)
         
-        for path in self.paths:
-            if len(path.points) > 2:
-                simplified = self._douglas_peucker(path.points, config.SIMPLIFY_EPSILON_MM)
-                path.points = simplified
+        epsilon = config.SIMPLIFY_EPSILON_MM
+        targets = [i for i, path in enumerate(self.paths) if len(path) > 2]
+        if targets and original_count >= PARALLEL_SIMPLIFY_MIN_POINTS and (os.cpu_count() or 1) > 1:
+            masks = self._parallel_douglas_peucker(targets, epsilon)
+        else:
+            masks = (self._douglas_peucker(self.paths[i].xs, self.paths[i].ys, epsilon) for i in targets)
+        
+        for i, keep in zip(targets, masks):
+            path = self.paths[i]
+            self.paths[i] = Path(path.xs[keep], path.ys[keep], path.moves[keep])
         
-        new_count = sum(len(p.points) for p in self.paths)
+        new_count = sum(len(p) for p in self.paths)
+        self._total_length = None
+        self._vertices = None
         print(f"Simplified: {original_count} → {new_count} points ({100*(original_count-new_count)/original_count:.1f}% reduction)")
     
-    def _douglas_peucker(self, points: List[Point], epsilon: float) -> List[Point]:
-        """Douglas-Peucker line simplification algorithm"""
-        if len(points) < 3:
-            return points
-        
-        # Find point with maximum distance from line
-        dmax = 0
-        index = 0
-        end = len(points) - 1
-        
-        for i in range(1, end):
-            d = self._perpendicular_distance(points[i], points[0], points[end])
-            if d > dmax:
-                index = i
-                dmax = d
-        
-        # If max distance > epsilon, recursively simplify
-        if dmax > epsilon:
-            rec1 = self._douglas_peucker(points[:index+1], epsilon)
-            rec2 = self._douglas_peucker(points[index:], epsilon)
-            return rec1[:-1] + rec2
-        else:
-            return [points[0], points[end]]
-    
-    def _perpendicular_distance(self, point: Point, line_start: Point, line_end: Point) -> float:
-        """Calculate perpendicular distance from point to line"""
-        dx = line_end.x - line_start.x
-        dy = line_end.y - line_start.y
+    def _parallel_douglas_peucker(self, targets: List[int], epsilon: float) -> List[np.ndarray]:
+        """
+        Douglas-Peucker keep-masks for many paths, spread over a process pool
+        
+        Args:
+            targets: Indices into self.paths to simplify
+            epsilon: Simplification tolerance (mm)
+        
+        Returns:
+            Keep-masks in the same order as targets
+        """
+        workers = os.cpu_count() or 1
+        num_chunks = min(len(targets), workers * 4)  # A few chunks per worker balances uneven paths
+        coords = [(self.paths[i].xs, self.paths[i].ys) for i in targets]
+        chunks = [coords[k::num_chunks] for k in range(num_chunks)]
         
-        if dx == 0 and dy == 0:
-            return math.sqrt((point.x - line_start.x)**2 + (point.y - line_start.y)**2)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_simplify_chunk, chunks, repeat(epsilon)))
         
-        t = max(0, min(1, ((point.x - line_start.x) * dx + (point.y - line_start.y) * dy) / (dx * dx + dy * dy)))
-        proj_x = line_start.x + t * dx
-        proj_y = line_start.y + t * dy
+        # Undo the strided split
+        masks = [None] * len(targets)
+        for k, chunk_masks in enumerate(results):
+            masks[k::num_chunks] = chunk_masks
+        return masks
+    
+    def _douglas_peucker(self, xs: np.ndarray, ys: np.ndarray, epsilon: float) -> np.ndarray:
+        """
+        Douglas-Peucker line simplification algorithm
         
-        return math.sqrt((point.x - proj_x)**2 + (point.y - proj_y)**2)
+        Returns:
+            Boolean mask of the points to keep
+        """
+        return _douglas_peucker_mask(xs, ys, epsilon)
     
     def optimize_path_order(self) -> None:
         """
@@ -462,123 +1034,200 @@ class SSGCompiler:
         if len(self.paths) <= 1:
             return
         
-        optimized = [self.paths[0]]
-        remaining = self.paths[1:]
+        starts = np.array([(path.xs[0], path.ys[0]) for path in self.paths])
+        ends = np.array([(path.xs[-1], path.ys[-1]) for path in self.paths])
         
-        while remaining:
-            last_point = optimized[-1].points[-1]
-            
-            # Find nearest path
-            nearest_idx = 0
-            nearest_dist = float('inf')
+        if cKDTree is not None and len(self.paths) >= KDTREE_MIN_PATHS:
+            order = self._nearest_order_kdtree(starts, ends)
+        else:
+            order = self._nearest_order_argmin(starts, ends)
+        
+        self.paths = [self.paths[i] for i in order]
+        self._vertices = None
+        print(f"Path order optimized")
+    
+    def _nearest_order_argmin(self, starts: np.ndarray, ends: np.ndarray) -> List[int]:
+        """Greedy nearest-neighbor order, one vectorized argmin per step (O(N^2))"""
+        starts_x = starts[:, 0]
+        starts_y = starts[:, 1]
+        alive = np.ones(len(starts), dtype=bool)
+        alive[0] = False
+        
+        order = [0]
+        for _ in range(len(starts) - 1):
+            last_x, last_y = ends[order[-1]]
             
-            for i, path in enumerate(remaining):
-                dist = math.sqrt(
-                    (path.points[0].x - last_point.x)**2 +
-                    (path.points[0].y - last_point.y)**2
-                )
-                if dist < nearest_dist:
-                    nearest_dist = dist
-                    nearest_idx = i
+            # Find nearest remaining path start (squared distance is enough for argmin)
+            d_sq = (starts_x - last_x)**2 + (starts_y - last_y)**2
+            d_sq[~alive] = np.inf
+            nearest_idx = int(np.argmin(d_sq))
             
-            optimized.append(remaining.pop(nearest_idx))
+            alive[nearest_idx] = False
+            order.append(nearest_idx)
+        return order
+    
+    def _nearest_order_kdtree(self, starts: np.ndarray, ends: np.ndarray) -> List[int]:
+        """Greedy nearest-neighbor order using a k-d tree over path starts (~O(N log N))"""
+        n = len(starts)
+        alive = np.ones(n, dtype=bool)
+        alive[0] = False
+        remaining = n - 1
         
-        self.paths = optimized
-        print(f"Path order optimized")
+        ids = np.arange(n)  # Tree row -> path index
+        tree = cKDTree(starts)
+        
+        order = [0]
+        while remaining:
+            # Rebuild over unused starts once most of the tree is used up
+            if 2 * remaining < len(ids):
+                ids = np.flatnonzero(alive)
+                tree = cKDTree(starts[ids])
+            
+            # Widen the query until it reaches an unused start
+            k = min(8, len(ids))
+            while True:
+                _, rows = tree.query(ends[order[-1]], k=k)
+                hits = ids[np.atleast_1d(rows)]
+                hits = hits[alive[hits]]
+                if hits.size or k == len(ids):
+                    break
+                k = min(2 * k, len(ids))
+            
+            nearest_idx = int(hits[0])
+            alive[nearest_idx] = False
+            order.append(nearest_idx)
+            remaining -= 1
+        return order
     
-    def compile_to_ssg(self) -> List[str]:
+    def compile_to_ssg(self, out_stream: Optional[TextIO] = None) -> List[str]:
         """
         Compile paths to SSG commands
         Following Design Doc Section 5.3 (Protocol)
+        
+        Args:
+            out_stream: If given, each line is written straight to this text
+                stream instead of being collected in memory
+        
+        Returns:
+            List of SSG commands (empty when streamed to out_stream)
         """
         print("Compiling to SSG...")
         self.ssg_lines = []
+        if out_stream is None:
+            emit = self.ssg_lines.append
+            def emit_block(block: str) -> None:
+                self.ssg_lines.extend(block.splitlines())
+        else:
+            write = out_stream.write
+            def emit(line: str) -> None:
+                write(line)
+                write('\n')
+            emit_block = write
         n = 1  # Sequence number
+        num_rapid = num_draw = 0
+        
+        # Bind per-command constants once, outside the emit loop
+        flow = config.SAUCE_FLOW_DEFAULT
+        feed_rapid = config.FEED_RATE_RAPID
+        draw_template = f"N%d G1 X%.2f Y%.2f F{config.FEED_RATE_DRAW}\n"
         
         # Start with homing command
-        self.ssg_lines.append(f"N{n} G28")
+        emit(f"N{n} G28")
         n += 1
         
         sauce_on = False
         
-        for path in self.paths:
-            if not path.points:
-                continue
+        # Flatten the whole job once so the loop below only indexes lists
+        paths = [path for path in self.paths if len(path)]
+        if paths:
+            xs = np.concatenate([path.xs for path in paths]).tolist()
+            ys = np.concatenate([path.ys for path in paths]).tolist()
+            move_idx = np.flatnonzero(np.concatenate([path.moves for path in paths])).tolist()
+        else:
+            xs = ys = move_idx = []
+        move_idx.append(len(xs))  # Sentinel past the last point
+        mi = 0  # Next entry in move_idx
+        lo = 0  # First point of the current path
+        
+        for path in paths:
+            hi = lo + len(path)
             
             # Turn sauce on for this path
             if not sauce_on:
-                self.ssg_lines.append(f"N{n} M3 S{config.SAUCE_FLOW_DEFAULT}")
+                emit(f"N{n} M3 S{flow}")
                 n += 1
                 sauce_on = True
             
-            # Generate movement commands
-            for i, point in enumerate(path.points):
-                if point.is_move:
-                    # Rapid move with sauce off
-                    if sauce_on:
-                        self.ssg_lines.append(f"N{n} M5")
-                        n += 1
-                        sauce_on = False
-                    self.ssg_lines.append(f"N{n} G0 X{point.x:.2f} Y{point.y:.2f} F{config.FEED_RATE_RAPID}")
-                    n += 1
-                    
-                    # Turn sauce back on after move
-                    self.ssg_lines.append(f"N{n} M3 S{config.SAUCE_FLOW_DEFAULT}")
-                    n += 1
-                    sauce_on = True
-                else:
-                    # Drawing move
-                    self.ssg_lines.append(f"N{n} G1 X{point.x:.2f} Y{point.y:.2f} F{config.FEED_RATE_DRAW}")
+            # Alternate draw runs (formatted as one block) and rapid moves
+            draw_from = lo
+            while True:
+                stop = min(move_idx[mi], hi)
+                if stop > draw_from:
+                    emit_block(_format_draw_run(draw_template, n, xs[draw_from:stop], ys[draw_from:stop]))
+                    n += stop - draw_from
+                    num_draw += stop - draw_from
+                if stop == hi:
+                    break
+                
+                # Rapid move with sauce off
+                if sauce_on:
+                    emit(f"N{n} M5")
                     n += 1
+                    sauce_on = False
+                emit(f"N{n} G0 X{xs[stop]:.2f} Y{ys[stop]:.2f} F{feed_rapid}")
+                n += 1
+                num_rapid += 1
+                
+                # Turn sauce back on after move
+                emit(f"N{n} M3 S{flow}")
+                n += 1
+                sauce_on = True
+                
+                mi += 1
+                draw_from = stop + 1
+            lo = hi
             
             # Turn sauce off after path
             if sauce_on:
-                self.ssg_lines.append(f"N{n} M5")
+                emit(f"N{n} M5")
                 n += 1
                 sauce_on = False
         
         # Final sauce off and status report
         if sauce_on:
-            self.ssg_lines.append(f"N{n} M5")
+            emit(f"N{n} M5")
             n += 1
         
-        self.ssg_lines.append(f"N{n} M114")  # Report position
+        emit(f"N{n} M114")  # Report position
+        self.num_commands = n
+        self.num_rapid = num_rapid
+        self.num_draw = num_draw
         
-        print(f"Compiled {len(self.ssg_lines)} SSG commands")
+        print(f"Compiled {self.num_commands} SSG commands")
         return self.ssg_lines
     
     def save_ssg(self, filepath: str) -> None:
         """Save SSG commands to file"""
-        with open(filepath, 'w') as f:
-            f.write('\n'.join(self.ssg_lines))
+        with open(filepath, 'w', buffering=SSG_WRITE_BUFFER) as f:
+            f.writelines(line + '\n' for line in self.ssg_lines)
         print(f"Saved SSG to: {filepath}")
     
     def get_statistics(self) -> dict:
-        """Get compilation statistics"""
-        total_rapid = 0.0
-        total_draw = 0.0
-        
-        for line in self.ssg_lines:
-            if ' G0 ' in line:
-                total_rapid += 1
-            elif ' G1 ' in line:
-                total_draw += 1
-        
-        total_length = sum(p.length() for p in self.paths)
-        estimated_time = (total_draw * 60 / config.FEED_RATE_DRAW +
-                         total_rapid * 60 / config.FEED_RATE_RAPID)
+        """Get compilation statistics (counts are tallied during compile_to_ssg)"""
+        total_length = self.total_length()
+        estimated_time = (self.num_draw * 60 / config.FEED_RATE_DRAW +
+                         self.num_rapid * 60 / config.FEED_RATE_RAPID)
         
         return {
             'num_paths': len(self.paths),
-            'num_commands': len(self.ssg_lines),
+            'num_commands': self.num_commands,
             'total_length_mm': total_length,
-            'rapid_moves': int(total_rapid),
-            'draw_moves': int(total_draw),
+            'rapid_moves': self.num_rapid,
+            'draw_moves': self.num_draw,
             'estimated_time_sec': estimated_time,
             'warnings': self.warnings
         }
 
-
 def main():
     """Example usage"""
     import sys
@@ -596,8 +1245,9 @@ def main():
     compiler.normalize()
     compiler.simplify()
     compiler.optimize_path_order()
-    compiler.compile_to_ssg()
-    compiler.save_ssg(output_file)
+    with open(output_file, 'w', buffering=SSG_WRITE_BUFFER) as f:
+        compiler.compile_to_ssg(out_stream=f)
+    print(f"Saved SSG to: {output_file}")
     
     # Print statistics
     stats = compiler.get_statistics()
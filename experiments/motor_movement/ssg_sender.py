@@ -7,22 +7,136 @@ Design Doc Section 6.4 (Device Streamer)
 """
 
 import asyncio
+import atexit
+import heapq
+import logging
+import logging.handlers
+import queue
+import re
+import socket
+import sys
 import websockets
 import json
-import time
-from typing import List, Optional, Callable
+from contextlib import closing
+from typing import Any, AsyncIterable, AsyncIterator, Coroutine, Iterable, Iterator, List, Optional, Callable, Tuple, Union
 from dataclasses import dataclass
-from pathlib import Path
 
 import config
 
+try:
+    import orjson  # Optional: faster telemetry parsing
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
-@dataclass
+try:
+    import uvloop  # Optional: libuv-backed event loop
+except ImportError:
+    uvloop = None
+
+# Acks are matched on the whole line in one pass, ahead of the dispatch
+# table; they may cover a run of consecutive lines as "ok N120..123"
+_ACK_RE = re.compile(r'ok N(\d+)(?:\.\.(\d+))?')
+# Sequence number in a "done N123" payload
+_SEQ_RE = re.compile(r'N(\d+)')
+
+# Diagnostics are formatted and written to stdout by a listener thread, so
+# code on the event loop only appends to a queue (never blocks on a terminal)
+_log_q: queue.Queue = queue.Queue(-1)
+_listener = logging.handlers.QueueListener(_log_q, logging.StreamHandler(sys.stdout))
+_listener.handlers[0].setFormatter(logging.Formatter('%(message)s'))
+_listener.start()
+atexit.register(_listener.stop)
+
+log = logging.getLogger('ssg')
+log.addHandler(logging.handlers.QueueHandler(_log_q))
+log.setLevel(logging.INFO)
+log.propagate = False
+
+# Pending telemetry / status / error callbacks; the oldest is dropped when full
+CALLBACK_QUEUE_SIZE = 64
+
+
+def run_async(main: Coroutine) -> Any:
+    """Run a top-level coroutine on uvloop when installed, else asyncio"""
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
+
+
+async def _flush_log():
+    """Wait (off the loop) until queued log records are written, so they
+    land before whatever the caller prints next"""
+    await asyncio.get_running_loop().run_in_executor(None, _log_q.join)
+
+
+# A streamed command: a raw "N123 ..." line, or (seq, line) with seq pre-parsed.
+# Lines given as ASCII bytes go out as binary frames with no per-send encoding.
+SSGCommand = Union[str, bytes, Tuple[Optional[int], Union[str, bytes]]]
+
+
+async def _as_aiter(commands: Union[Iterable[SSGCommand], AsyncIterable[SSGCommand]]) -> AsyncIterator[SSGCommand]:
+    """Iterate plain and async iterables alike"""
+    if hasattr(commands, '__aiter__'):
+        async for cmd in commands:
+            yield cmd
+    else:
+        for cmd in commands:
+            yield cmd
+
+
+def _parse_seq(cmd: Union[str, bytes]) -> Optional[int]:
+    """Sequence number of an "N123 ..." line (str or bytes), or None if it has none"""
+    end = cmd.find(b' ' if isinstance(cmd, bytes) else ' ')
+    head = cmd[:end] if end > 0 else cmd
+    if head[:1] not in ('N', b'N'):
+        return None
+    try:
+        return int(head[1:])
+    except ValueError:
+        return None
+
+
+def _read_ssg_file(filepath: str) -> Iterator[Tuple[Optional[int], bytes]]:
+    """
+    Yield (seq, line) for each command in an SSG file, one line at a time
+    
+    Lines stay ASCII bytes (encoded once, sent as binary frames) and each
+    sequence number is parsed once here.
+    """
+    with open(filepath, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield _parse_seq(line), line
+
+
+def _join_lines(lines: List[Union[str, bytes]]) -> Union[str, bytes]:
+    """Newline-join one frame's lines; bytes lines make a binary frame"""
+    return (b'\n' if isinstance(lines[0], bytes) else '\n').join(lines)
+
+
+def _pack_frames(lines: List[Union[str, bytes]], max_bytes: int) -> Iterator[Union[str, bytes]]:
+    """Join lines into newline-separated frames of at most max_bytes"""
+    frame: List[str] = []
+    size = 0
+    for line in lines:
+        if frame and size + len(line) + 1 > max_bytes:
+            yield _join_lines(frame)
+            frame, size = [], 0
+        frame.append(line)
+        size += len(line) + 1
+    if frame:
+        yield _join_lines(frame)
+
+
+@dataclass(slots=True)
 class CommandStatus:
     """Track status of in-flight command"""
     seq: int
-    line: str
-    sent_time: float
+    line: Union[str, bytes]
+    sent_time: float  # Event-loop (monotonic) clock
+    acked: asyncio.Future  # Resolves True on ack, False when retries run out
     retry_count: int = 0
 
 
@@ -36,16 +150,45 @@ class SSGSender:
         
         # Sliding window state
         self.in_flight: dict[int, CommandStatus] = {}
+        self._deadlines: List[Tuple[float, int]] = []  # Heap of (ack deadline, seq); may hold stale entries
         self.next_seq_to_send = 1
         self.last_acked_seq = 0
         
+        # Motion-complete waiters ("done N123" / "home_done" from ESP32)
+        self.motion_waiters: dict[int, asyncio.Future] = {}
+        self.home_waiter: Optional[asyncio.Future] = None
+        self.status_waiter: Optional[asyncio.Future] = None
+        self._receiver_task: Optional[asyncio.Task] = None
+        self._callback_queue: Optional[asyncio.Queue] = None
+        self._callback_task: Optional[asyncio.Task] = None
+        
+        self._window: Optional[asyncio.Semaphore] = None
+        self._effective_window = config.WINDOW_SIZE  # Tuned in-flight limit
+        self._window_debt = 0  # Slots to withhold after the window shrinks
+        self._clean_acks = 0  # Acks since the window last changed
+        self._rtt_ewma = 0.05  # Smoothed ack round-trip time (seconds)
+        self._flight_added: Optional[asyncio.Event] = None  # Wakes the idle timeout loop
+        self._to_send: Optional[asyncio.Queue] = None  # Producer -> writer task
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Monotonic clock for stream timing
+        self._total_commands = 0
+        
         # Statistics
         self.total_sent = 0
         self.total_acked = 0
         self.total_retries = 0
         self.start_time = None
         
-        # Callbacks
+        # Inbound dispatch on the first word of each non-ack ESP32 message.
+        # "busy" and "pos" are informational only and fall through.
+        self._handlers: dict[str, Callable[[str, str], None]] = {
+            'done': self._on_done,
+            'home_done': self._on_home_done,
+            'err': self._on_err,
+            'telemetry': self._on_telemetry_message,
+            'status': self._on_status_message,
+        }
+        
+        # Callbacks (run from a queue off the receive path; may be async)
         self.on_telemetry: Optional[Callable] = None
         self.on_status: Optional[Callable] = None
         self.on_error: Optional[Callable] = None
@@ -59,10 +202,28 @@ class SSGSender:
     async def connect(self) -> bool:
         """Connect to ESP32 WebSocket"""
         try:
-            print(f"Connecting to {self.uri}...")
-            self.websocket = await websockets.connect(self.uri)
+            log.info(f"Connecting to {self.uri}...")
+            # SSG lines are tiny ASCII frames: compression costs CPU on both
+            # ends for no real saving. The application-level window already
+            # bounds in-flight data, so keep library buffers small too.
+            # (write_limit as a plain int: the legacy client that
+            # websockets 12/13 return from connect() rejects a tuple)
+            self.websocket = await websockets.connect(
+                self.uri,
+                compression=None,
+                max_size=2**16,
+                max_queue=8,
+                write_limit=32768,
+            )
+            
+            # asyncio already disables Nagle on TCP sockets; make sure, since
+            # every frame is latency-bound (the legacy client has no .transport)
+            transport = getattr(self.websocket, 'transport', None)
+            sock = transport.get_extra_info('socket') if transport is not None else None
+            if sock is not None:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.is_connected = True
-            print("Connected!")
+            log.info("Connected!")
             
             # Request initial status
             await self.websocket.send("N0 M408")
@@ -70,16 +231,25 @@ class SSGSender:
             return True
             
         except Exception as e:
-            print(f"Connection failed: {e}")
+            log.error(f"Connection failed: {e}")
             self.is_connected = False
             return False
     
     async def disconnect(self):
         """Disconnect from ESP32"""
+        # Wait for the cancellations to land so no loop outlives the connection
+        tasks = [t for t in (self._receiver_task, self._callback_task) if t is not None]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks, timeout=1.0)
+        self._receiver_task = None
+        self._callback_task = None
         if self.websocket:
             await self.websocket.close()
             self.is_connected = False
-            print("Disconnected")
+            log.info("Disconnected")
+        await _flush_log()
     
     async def stream_ssg_file(self, filepath: str) -> bool:
         """
@@ -91,128 +261,277 @@ class SSGSender:
         Returns:
             True if successful, False otherwise
         """
-        # Load SSG commands
-        ssg_lines = Path(filepath).read_text().strip().split('\n')
-        ssg_lines = [line.strip() for line in ssg_lines if line.strip()]
+        # Count commands for progress without holding the file in memory
+        with open(filepath, 'rb') as f:
+            total = sum(1 for line in f if line.strip())
         
-        print(f"Loaded {len(ssg_lines)} commands from {filepath}")
+        log.info(f"Found {total} commands in {filepath}")
         
-        return await self.stream_commands(ssg_lines)
+        with closing(_read_ssg_file(filepath)) as commands:
+            return await self.stream_commands(commands, total=total)
     
-    async def stream_commands(self, commands: List[str]) -> bool:
+    async def stream_commands(
+        self,
+        commands: Union[Iterable[SSGCommand], AsyncIterable[SSGCommand]],
+        total: Optional[int] = None,
+    ) -> bool:
         """
-        Stream a list of SSG commands to ESP32
+        Stream SSG commands to ESP32
+        
+        Commands are pulled lazily, so a generator is only advanced as
+        window slots free up. A writer task sends each command as soon as
+        it is queued, sharing a frame with any others already waiting.
         
         Args:
-            commands: List of SSG command strings
+            commands: SSG command strings, or (seq, line) pairs with the
+                sequence number already parsed (list, generator or async generator)
+            total: Command count for progress, if commands has no len()
             
         Returns:
             True if successful, False otherwise
         """
         if not self.is_connected:
-            print("ERROR: Not connected to ESP32")
+            log.error("ERROR: Not connected to ESP32")
             return False
         
         self.is_streaming = True
         self.should_stop = False
-        self.start_time = time.time()
+        self._loop = asyncio.get_running_loop()
+        self.start_time = self._loop.time()
         self.total_sent = 0
         self.total_acked = 0
         self.total_retries = 0
+        self.in_flight.clear()
+        self._deadlines.clear()
+        self._effective_window = config.WINDOW_SIZE
+        self._window_debt = 0
+        self._clean_acks = 0
+        
+        if total is None:
+            total = len(commands) if hasattr(commands, '__len__') else 0
+        self._total_commands = total
         
-        total_commands = len(commands)
-        commands_to_send = list(commands)
+        log.info(f"\nStreaming {total or 'generated'} commands...")
+        log.info(f"Window size: {config.WINDOW_SIZE} "
+                 f"(auto {config.MIN_WINDOW_SIZE}-{config.MAX_WINDOW_SIZE})")
+        log.info(f"Ack timeout: {config.ACK_TIMEOUT_SEC}s")
+        log.info("="*60)
         
-        print(f"\nStreaming {total_commands} commands...")
-        print(f"Window size: {config.WINDOW_SIZE}")
-        print(f"Ack timeout: {config.ACK_TIMEOUT_SEC}s")
-        print("="*60)
+        self._window = asyncio.Semaphore(self._effective_window)
+        self._flight_added = asyncio.Event()
+        self._to_send = asyncio.Queue()
         
         try:
-            # Start receiver task
-            receiver_task = asyncio.create_task(self._receive_loop())
+            # Make sure acks are being received
+            self._ensure_receiver()
             
-            # Streaming loop
-            while commands_to_send or self.in_flight:
-                # Check for stop signal
-                if self.should_stop:
-                    print("\nStreaming stopped by user")
-                    break
-                
-                # Send commands up to window size
-                while len(self.in_flight) < config.WINDOW_SIZE and commands_to_send:
-                    cmd = commands_to_send.pop(0)
-                    await self._send_command(cmd)
-                
-                # Check for timeouts and retry
-                await self._check_timeouts()
-                
-                # Progress update
-                if self.on_progress:
-                    progress = self.total_acked / total_commands if total_commands > 0 else 0
-                    self.on_progress(progress, self.total_acked, total_commands)
-                
-                # Small delay to prevent busy loop
-                await asyncio.sleep(0.01)
-            
-            # Wait for all acks
-            print("\nWaiting for final acknowledgements...")
-            timeout = time.time() + 5.0
-            while self.in_flight and time.time() < timeout:
-                await self._check_timeouts()
-                await asyncio.sleep(0.1)
-            
-            # Cancel receiver
-            receiver_task.cancel()
+            # Background tasks live only as long as the stream; if one fails,
+            # the group cancels the producer and the error surfaces here
+            async with asyncio.TaskGroup() as tg:
+                background = [
+                    tg.create_task(self._timeout_loop()),
+                    tg.create_task(self._writer_loop()),
+                    tg.create_task(self._watch_receiver()),
+                ]
+                try:
+                    await self._send_loop(commands)
+                    
+                    # Wait for all acks
+                    log.info("\nWaiting for final acknowledgements...")
+                    pending = [status.acked for status in self.in_flight.values()]
+                    if pending:
+                        await asyncio.wait(pending, timeout=5.0)
+                finally:
+                    for task in background:
+                        task.cancel()
             
             # Final statistics
-            elapsed = time.time() - self.start_time
+            elapsed = self._loop.time() - self.start_time
             self._print_statistics(elapsed)
             
             success = len(self.in_flight) == 0 and not self.should_stop
             
             if success:
-                print("\n✅ Streaming completed successfully!")
+                log.info("\n✅ Streaming completed successfully!")
             else:
-                print("\n❌ Streaming incomplete")
-                print(f"Commands still in flight: {len(self.in_flight)}")
+                log.warning("\n❌ Streaming incomplete")
+                log.warning(f"Commands still in flight: {len(self.in_flight)}")
             
             self.is_streaming = False
             return success
             
         except Exception as e:
-            print(f"\nERROR during streaming: {e}")
+            if isinstance(e, ExceptionGroup):
+                e = e.exceptions[0]  # Report the task failure, not the group
+            log.error(f"\nERROR during streaming: {e}")
             self.is_streaming = False
             return False
+        
+        finally:
+            self._window = None
+            self._flight_added = None
+            self._to_send = None
+            await _flush_log()
     
-    async def _send_command(self, cmd: str):
-        """Send a command and track it"""
-        # Extract sequence number (should already be in format "N123 ...")
-        # If not, this is an error
-        if not cmd.startswith('N'):
-            print(f"WARNING: Command missing sequence number: {cmd}")
-            return
+    async def _send_loop(self, commands: Union[Iterable[SSGCommand], AsyncIterable[SSGCommand]]):
+        """
+        Producer: queue commands for the writer task as window slots free up
         
-        # Parse sequence number
-        parts = cmd.split(' ', 1)
-        seq_str = parts[0][1:]  # Remove 'N'
-        try:
-            seq = int(seq_str)
-        except ValueError:
-            print(f"WARNING: Invalid sequence number: {cmd}")
-            return
+        A slot is freed by each ack (or give-up). Returns once everything
+        queued has been handed to the WebSocket, or when stopped.
+        """
+        async for cmd in _as_aiter(commands):
+            if isinstance(cmd, tuple):
+                seq, cmd = cmd
+            else:
+                seq = _parse_seq(cmd)
+            
+            await self._window.acquire()
+            
+            # Check for stop signal
+            if self.should_stop:
+                log.info("\nStreaming stopped by user")
+                return
+            
+            self._to_send.put_nowait((seq, cmd))
         
-        # Send command
-        await self.websocket.send(cmd)
+        # Let the writer flush what's queued
+        await self._to_send.join()
+    
+    async def _watch_receiver(self):
+        """Fail the stream if the receive loop stops, since no more acks can arrive"""
+        await asyncio.wait({self._receiver_task})
+        raise ConnectionError("Receiver stopped while streaming")
+    
+    async def _writer_loop(self):
+        """Send queued commands, coalescing whatever is ready into one frame"""
+        queue = self._to_send
+        carry = None  # Command that didn't fit in the previous frame
+        while True:
+            item = carry or await queue.get()
+            carry = None
+            batch = [item]
+            batch_bytes = len(item[1]) + 1
+            while not queue.empty():
+                item = queue.get_nowait()
+                if batch_bytes + len(item[1]) + 1 > config.MAX_FRAME_BYTES:
+                    carry = item
+                    break
+                batch.append(item)
+                batch_bytes += len(item[1]) + 1
+            
+            await self._send_batch(batch)
+            for _ in batch:
+                queue.task_done()
+    
+    async def _send_batch(self, batch: List[Tuple[Optional[int], Union[str, bytes]]]):
+        """Track a batch of (seq, line) commands and send them as one newline-joined frame"""
+        lines = [cmd for seq, cmd in batch if self._track_command(seq, cmd)]
+        if lines:
+            await self.websocket.send(_join_lines(lines))
+    
+    def _track_command(self, seq: Optional[int], cmd: Union[str, bytes]) -> bool:
+        """Register a command as in flight; returns False if it can't be sent"""
+        # Every streamed line must carry a sequence number ("N123 ...")
+        if seq is None:
+            log.warning(f"WARNING: Missing or invalid sequence number: {cmd}")
+            self._release_slot()
+            return False
         
-        # Track in flight
+        # Track in flight (before sending, so a fast ack can't be missed)
+        now = self._loop.time()
         self.in_flight[seq] = CommandStatus(
             seq=seq,
             line=cmd,
-            sent_time=time.time()
+            sent_time=now,
+            acked=self._loop.create_future()
         )
+        heapq.heappush(self._deadlines, (now + config.ACK_TIMEOUT_SEC, seq))
         
         self.total_sent += 1
+        if self._flight_added is not None:
+            self._flight_added.set()
+        return True
+    
+    def _ensure_receiver(self):
+        """Start the background receive and callback loops if they aren't already running"""
+        if self._receiver_task is None or self._receiver_task.done():
+            self._receiver_task = asyncio.create_task(self._receive_loop())
+        if self._callback_task is None or self._callback_task.done():
+            self._callback_queue = asyncio.Queue(maxsize=CALLBACK_QUEUE_SIZE)
+            self._callback_task = asyncio.create_task(self._callback_loop())
+    
+    def _post_callback(self, callback: Optional[Callable], arg: Any):
+        """Queue a user callback so slow handlers never hold up ack processing"""
+        if callback is None or self._callback_queue is None:
+            return
+        queue = self._callback_queue
+        if queue.full():
+            queue.get_nowait()  # Drop the oldest event
+        queue.put_nowait((callback, arg))
+    
+    async def _callback_loop(self):
+        """Run queued user callbacks in order (awaiting any that are coroutines)"""
+        queue = self._callback_queue
+        while True:
+            callback, arg = await queue.get()
+            try:
+                result = callback(arg)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                log.error(f"Callback error: {e}")
+    
+    async def send_line(self, cmd: str):
+        """
+        Send a single SSG line outside of a stream
+        
+        A waiter for the line's sequence number is registered before sending,
+        so a fast "done N123" can't be missed by a later wait_for_done().
+        """
+        self._ensure_receiver()
+        seq = int(cmd.split(' ', 1)[0][1:])
+        if seq not in self.motion_waiters:
+            self.motion_waiters[seq] = asyncio.get_running_loop().create_future()
+        await self.websocket.send(cmd)
+    
+    async def wait_for_done(self, seq: int, timeout: float = config.MOTION_TIMEOUT_SEC) -> bool:
+        """
+        Wait until the ESP32 reports the motion for line N<seq> is complete
+        
+        Returns:
+            True if "done N<seq>" (or a later N) arrived, False on timeout
+        """
+        self._ensure_receiver()
+        waiter = self.motion_waiters.get(seq)
+        if waiter is None:
+            waiter = asyncio.get_running_loop().create_future()
+            self.motion_waiters[seq] = waiter
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.motion_waiters.pop(seq, None)
+    
+    async def wait_for_home(self, timeout: float = config.HOMING_TIMEOUT_SEC) -> bool:
+        """
+        Wait until the ESP32 reports homing is complete
+        
+        Returns:
+            True if "home_done" arrived, False on timeout
+        """
+        self._ensure_receiver()
+        if self.home_waiter is None:
+            self.home_waiter = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(self.home_waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            self.home_waiter = None
     
     async def _receive_loop(self):
         """Receive and handle responses from ESP32"""
@@ -222,96 +541,192 @@ class SSGSender:
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            print(f"Receiver error: {e}")
+            log.error(f"Receiver error: {e}")
     
     async def _handle_response(self, message: str):
         """Handle a response from ESP32"""
         message = message.strip()
         
-        # Parse response type
-        if message.startswith("ok"):
-            # Ack: "ok N123"
-            parts = message.split()
-            if len(parts) >= 2 and parts[1].startswith('N'):
-                seq = int(parts[1][1:])
+        # Ack: "ok N123", or "ok N120..123" for a run of lines
+        m = _ACK_RE.match(message)
+        if m:
+            first = int(m.group(1))
+            last = int(m.group(2) or first)
+            for seq in range(first, last + 1):
                 self._handle_ack(seq)
+            return
         
-        elif message.startswith("err"):
-            # Error: "err N123 code=LIMIT"
-            print(f"\n⚠️  ESP32 Error: {message}")
-            if self.on_error:
-                self.on_error(message)
-        
-        elif message.startswith("busy"):
-            # Busy: "busy q=32 state=PRINTING"
-            # Just wait, don't send more
-            pass
-        
-        elif message.startswith("telemetry"):
-            # Telemetry: "telemetry {...json...}"
-            try:
-                json_str = message.split(' ', 1)[1]
-                data = json.loads(json_str)
-                if self.on_telemetry:
-                    self.on_telemetry(data)
-            except Exception as e:
-                print(f"Failed to parse telemetry: {e}")
-        
-        elif message.startswith("status"):
-            # Status: "status state=READY q=0 ..."
-            if self.on_status:
-                self.on_status(message)
-        
-        elif message.startswith("pos"):
-            # Position report: "pos X:10.00 Y:20.00"
-            pass  # Just informational
+        kind, _, payload = message.partition(' ')
+        handler = self._handlers.get(kind)
+        if handler:
+            handler(message, payload)
+    
+    def _on_done(self, message: str, payload: str):
+        """Motion complete ("done N123": queue drained, every move up to N123 finished)"""
+        m = _SEQ_RE.match(payload)
+        if m:
+            seq = int(m.group(1))
+            for waiter_seq, waiter in self.motion_waiters.items():
+                if waiter_seq <= seq and not waiter.done():
+                    waiter.set_result(True)
+    
+    def _on_home_done(self, message: str, payload: str):
+        """Homing complete ("home_done")"""
+        if self.home_waiter and not self.home_waiter.done():
+            self.home_waiter.set_result(True)
+    
+    def _on_err(self, message: str, payload: str):
+        """Error ("err N123 code=LIMIT")"""
+        log.warning("\n⚠️  ESP32 Error: %s", message)
+        self._post_callback(self.on_error, message)
+    
+    def _on_telemetry_message(self, message: str, payload: str):
+        """Telemetry ("telemetry {...json...}")"""
+        try:
+            data = _json_loads(payload)
+        except Exception as e:
+            log.warning(f"Failed to parse telemetry: {e}")
+            return
+        self._post_callback(self.on_telemetry, data)
+    
+    def _on_status_message(self, message: str, payload: str):
+        """Status ("status state=READY q=0 ...")"""
+        if self.status_waiter and not self.status_waiter.done():
+            self.status_waiter.set_result(message)
+        self._post_callback(self.on_status, message)
     
     def _handle_ack(self, seq: int):
         """Handle acknowledgement of command"""
-        if seq in self.in_flight:
-            del self.in_flight[seq]
-            self.total_acked += 1
-            self.last_acked_seq = max(self.last_acked_seq, seq)
+        status = self.in_flight.pop(seq, None)
+        if status is None:
+            return
+        status.acked.set_result(True)
+        self.total_acked += 1
+        self.last_acked_seq = max(self.last_acked_seq, seq)
+        if status.retry_count == 0:
+            # Retried sends give ambiguous samples (which copy was acked?)
+            sample = self._loop.time() - status.sent_time
+            self._rtt_ewma = 0.875 * self._rtt_ewma + 0.125 * sample
+        self._release_slot()
+        
+        # Additive increase: one more slot per window of clean acks
+        self._clean_acks += 1
+        if self._clean_acks >= self._effective_window:
+            self._grow_window()
+        
+        # Progress update
+        if self.on_progress:
+            total = self._total_commands
+            progress = self.total_acked / total if total > 0 else 0
+            self.on_progress(progress, self.total_acked, total)
+    
+    def _release_slot(self):
+        """Free a sliding-window slot for the producer"""
+        if self._window is None:
+            return
+        if self._window_debt > 0:
+            # Window shrank: retire this slot instead of handing it back
+            self._window_debt -= 1
+        else:
+            self._window.release()
+    
+    def _grow_window(self):
+        """Raise the in-flight limit by one, up to MAX_WINDOW_SIZE"""
+        self._clean_acks = 0
+        if self._effective_window >= config.MAX_WINDOW_SIZE:
+            return
+        self._effective_window += 1
+        if self._window_debt > 0:
+            self._window_debt -= 1
+        elif self._window is not None:
+            self._window.release()
+    
+    def _shrink_window(self):
+        """Halve the in-flight limit after timeouts, down to MIN_WINDOW_SIZE"""
+        self._clean_acks = 0
+        target = max(config.MIN_WINDOW_SIZE, self._effective_window // 2)
+        self._window_debt += self._effective_window - target
+        self._effective_window = target
+    
+    async def _timeout_loop(self):
+        """Retry overdue commands, sleeping until the earliest live ack deadline"""
+        deadlines = self._deadlines
+        while True:
+            # Drop entries for commands that were acked or re-sent since
+            while deadlines and self._is_stale(*deadlines[0]):
+                heapq.heappop(deadlines)
+            
+            if not deadlines:
+                # Idle: nothing can time out until another command goes out
+                self._flight_added.clear()
+                await self._flight_added.wait()
+                continue
+            
+            await asyncio.sleep(max(0.0, deadlines[0][0] - self._loop.time()))
+            await self._check_timeouts()
+    
+    def _is_stale(self, deadline: float, seq: int) -> bool:
+        """True if a deadline heap entry no longer matches an in-flight send"""
+        status = self.in_flight.get(seq)
+        return status is None or status.sent_time + config.ACK_TIMEOUT_SEC != deadline
     
     async def _check_timeouts(self):
-        """Check for timed-out commands and retry"""
-        now = time.time()
-        
-        for seq, status in list(self.in_flight.items()):
-            if now - status.sent_time > config.ACK_TIMEOUT_SEC:
-                # Timeout - retry
-                if status.retry_count < config.MAX_RETRIES:
-                    print(f"\n⏱️  Timeout N{seq}, retrying ({status.retry_count + 1}/{config.MAX_RETRIES})")
-                    status.retry_count += 1
-                    status.sent_time = now
-                    await self.websocket.send(status.line)
-                    self.total_retries += 1
-                else:
-                    print(f"\n❌ Max retries exceeded for N{seq}")
-                    del self.in_flight[seq]
-                    if self.on_error:
-                        self.on_error(f"Max retries exceeded: N{seq}")
+        """Retry commands whose ack deadline has passed (all overdue lines in one send)"""
+        now = self._loop.time()
+        resend = []
+        deadlines = self._deadlines
+        
+        while deadlines and deadlines[0][0] <= now:
+            deadline, seq = heapq.heappop(deadlines)
+            if self._is_stale(deadline, seq):
+                continue
+            status = self.in_flight[seq]
+            
+            # Timeout - retry
+            if status.retry_count < config.MAX_RETRIES:
+                log.warning("\n⏱️  Timeout N%d, retrying (%d/%d)", seq, status.retry_count + 1, config.MAX_RETRIES)
+                status.retry_count += 1
+                status.sent_time = now
+                heapq.heappush(deadlines, (now + config.ACK_TIMEOUT_SEC, seq))
+                resend.append(status.line)
+                self.total_retries += 1
+            else:
+                log.error("\n❌ Max retries exceeded for N%d", seq)
+                del self.in_flight[seq]
+                status.acked.set_result(False)
+                self._release_slot()
+                self._post_callback(self.on_error, f"Max retries exceeded: N{seq}")
+        
+        if resend:
+            # Multiplicative decrease, once per batch of timeouts
+            self._shrink_window()
+        for frame in _pack_frames(resend, config.MAX_FRAME_BYTES):
+            await self.websocket.send(frame)
     
     def _print_statistics(self, elapsed: float):
         """Print streaming statistics"""
-        print("\n" + "="*60)
-        print("STREAMING STATISTICS")
-        print("="*60)
-        print(f"Total sent: {self.total_sent}")
-        print(f"Total acked: {self.total_acked}")
-        print(f"Total retries: {self.total_retries}")
-        print(f"Success rate: {100*self.total_acked/self.total_sent:.1f}%" if self.total_sent > 0 else "N/A")
-        print(f"Elapsed time: {elapsed:.1f}s")
-        print(f"Throughput: {self.total_acked/elapsed:.1f} commands/sec" if elapsed > 0 else "N/A")
+        log.info("\n" + "="*60)
+        log.info("STREAMING STATISTICS")
+        log.info("="*60)
+        log.info(f"Total sent: {self.total_sent}")
+        log.info(f"Total acked: {self.total_acked}")
+        log.info(f"Total retries: {self.total_retries}")
+        log.info(f"Final window: {self._effective_window} (RTT ~{self._rtt_ewma*1000:.1f} ms)")
+        log.info(f"Success rate: {100*self.total_acked/self.total_sent:.1f}%" if self.total_sent > 0 else "N/A")
+        log.info(f"Elapsed time: {elapsed:.1f}s")
+        log.info(f"Throughput: {self.total_acked/elapsed:.1f} commands/sec" if elapsed > 0 else "N/A")
     
     def stop(self):
         """Stop streaming"""
         self.should_stop = True
     
     async def send_home(self):
-        """Send homing command"""
+        """Send homing command (await wait_for_home() for completion)"""
         if not self.is_connected:
             return False
+        self._ensure_receiver()
+        if self.home_waiter is None:
+            self.home_waiter = asyncio.get_running_loop().create_future()
         await self.websocket.send("N0 G28")
         return True
     
@@ -322,12 +737,25 @@ class SSGSender:
         await self.websocket.send("N0 M5")
         return True
     
-    async def request_status(self):
-        """Request status from ESP32"""
+    async def request_status(self, timeout: float = config.ACK_TIMEOUT_SEC) -> Optional[str]:
+        """
+        Request status from ESP32 and wait for the reply
+        
+        Concurrent callers share one in-flight M408 request.
+        
+        Returns:
+            The "status ..." line, or None on timeout / not connected
+        """
         if not self.is_connected:
-            return False
-        await self.websocket.send("N0 M408")
-        return True
+            return None
+        self._ensure_receiver()
+        if self.status_waiter is None or self.status_waiter.done():
+            self.status_waiter = asyncio.get_running_loop().create_future()
+            await self.websocket.send("N0 M408")
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.status_waiter), timeout)
+        except asyncio.TimeoutError:
+            return None
 
 
 # ============================================
@@ -336,7 +764,6 @@ class SSGSender:
 
 async def main():
     """Command-line interface for SSG sender"""
-    import sys
     import argparse
     
     parser = argparse.ArgumentParser(description="Stream SSG commands to ESP32 plotter")
@@ -357,11 +784,20 @@ async def main():
     def on_error(msg):
         print(f"\n❌ Error: {msg}")
     
+    last_percent = -1
+    
     def on_progress(progress, acked, total):
+        # Redraw only when the whole percentage changes, not on every ack
+        nonlocal last_percent
+        percent = int(progress * 100)
+        if percent == last_percent:
+            return
+        last_percent = percent
         bar_length = 40
         filled = int(bar_length * progress)
         bar = '█' * filled + '░' * (bar_length - filled)
-        print(f"\r[{bar}] {progress*100:.1f}% ({acked}/{total})", end='')
+        sys.stdout.write(f"\r[{bar}] {progress*100:.1f}% ({acked}/{total})")
+        sys.stdout.flush()
     
     sender.on_telemetry = on_telemetry
     sender.on_error = on_error
@@ -376,7 +812,10 @@ async def main():
     if args.home_first:
         print("Sending homing command...")
         await sender.send_home()
-        await asyncio.sleep(10)  # Wait for homing to complete
+        if not await sender.wait_for_home():
+            print("Homing did not complete in time")
+            await sender.disconnect()
+            return 1
     
     # Stream file
     success = await sender.stream_ssg_file(args.ssg_file)
@@ -389,7 +828,7 @@ async def main():
 
 if __name__ == "__main__":
     try:
-        exit_code = asyncio.run(main())
+        exit_code = run_async(main())
         sys.exit(exit_code)
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
@@ -5,7 +5,7 @@ Simple connection test - verifies basic WebSocket communication
 
 import asyncio
 import config
-from ssg_sender import SSGSender
+from ssg_sender import SSGSender, run_async
 
 
 async def test_connection():
@@ -85,7 +85,7 @@ async def test_connection():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(test_connection())
+        run_async(test_connection())
     except KeyboardInterrupt:
         print("\n\nTest cancelled")
     except Exception as e:
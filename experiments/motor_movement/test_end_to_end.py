@@ -4,12 +4,11 @@ End-to-end test for Sriracha Sketcher
 Tests the complete pipeline: SVG → SSG → ESP32
 """
 
-import asyncio
 import sys
 from pathlib import Path
 
 from ssg_compiler import SSGCompiler
-from ssg_sender import SSGSender
+from ssg_sender import SSGSender, run_async
 import config
 
 
@@ -113,8 +112,11 @@ async def test_complete_pipeline(svg_file: str, esp32_ip: str = None):
     print("Sending G28 (home all axes)...")
     await sender.send_home()
     
-    print("Waiting for homing to complete (15 seconds)...")
-    await asyncio.sleep(15)
+    print("Waiting for homing to complete...")
+    if not await sender.wait_for_home():
+        print("\n❌ Homing did not complete in time")
+        await sender.disconnect()
+        return False
     
     print("✅ Homing complete")
     
@@ -274,6 +276,6 @@ Examples:
 
 
 if __name__ == "__main__":
-    sys.exit(asyncio.run(main()))
+    sys.exit(run_async(main()))
 
 
@@ -5,7 +5,7 @@ Test motor movement in TESTING_MODE (no homing required)
 
 import asyncio
 import config
-from ssg_sender import SSGSender
+from ssg_sender import SSGSender, run_async
 
 
 async def test_motors():
@@ -84,7 +84,7 @@ async def test_motors():
 
 if __name__ == "__main__":
     try:
-        asyncio.run(test_motors())
+        run_async(test_motors())
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
@@ -2,6 +2,8 @@
 """
 Plotter Simulator - Visualize motor instructions using matplotlib
 Shows pen-down paths (drawing) and pen-up paths (travel) in different colors
+
+Usage: python plot_simulator.py [instructions.json|.npz] [--publication] [--svg]
 """
 
 import json
@@ -10,47 +12,85 @@ import matplotlib.patches as patches
 from pathlib import Path
 import sys
 import numpy as np
+from matplotlib.collections import LineCollection
 from matplotlib.colors import LinearSegmentedColormap
 
+try:
+    import orjson  # Optional: faster instruction file parsing
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
 
 class PlotterSimulator:
     def __init__(self, instructions_file):
         """Initialize simulator with instruction file"""
         self.instructions_file = Path(instructions_file)
         self.instructions = []
+        self.xy_steps = np.empty((0, 2))  # (N, 2) x/y in motor steps
+        self.pen = np.empty(0, dtype=bool)  # True where the pen is down
         self.load_instructions()
     
     def load_instructions(self):
-        """Load motor instructions from JSON file"""
+        """Load motor instructions from a JSON or .npz file"""
         print(f"📄 Loading instructions from: {self.instructions_file}")
         
-        with open(self.instructions_file, 'r') as f:
-            self.instructions = json.load(f)
-        
-        print(f"✓ Loaded {len(self.instructions)} instructions")
+        if self.instructions_file.suffix == '.npz':
+            # Arrays saved by save_npz: no per-record parsing at all
+            with np.load(self.instructions_file) as data:
+                self.xy_steps = data['xy'].astype(np.float64)
+                self.pen = data['pen'].astype(bool)
+        else:
+            # Parse from bytes in one call (orjson when installed)
+            self.instructions = _json_loads(self.instructions_file.read_bytes())
+            
+            # Convert to arrays once; the plots only rescale these
+            self.xy_steps = np.array(
+                [(inst['x'], inst['y']) for inst in self.instructions], dtype=np.float64
+            ).reshape(-1, 2)
+            self.pen = np.fromiter(
+                (inst['penDown'] for inst in self.instructions), dtype=bool, count=len(self.instructions)
+            )
+        
+        print(f"✓ Loaded {len(self.pen)} instructions")
         print()
     
+    def save_npz(self, output_file=None):
+        """
+        Save the loaded instructions as a compressed .npz sibling file
+        
+        Args:
+            output_file: Destination path (defaults to the instruction file with .npz suffix)
+        
+        Returns:
+            Path of the written file
+        """
+        output_file = Path(output_file or self.instructions_file.with_suffix('.npz'))
+        np.savez_compressed(output_file, xy=self.xy_steps.astype(np.float32), pen=self.pen)
+        print(f"💾 Saved instruction arrays to: {output_file}")
+        return output_file
+    
     def analyze_instructions(self):
         """Analyze the instruction set"""
-        if not self.instructions:
+        if not len(self.pen):
             return
         
-        pen_down_count = sum(1 for inst in self.instructions if inst['penDown'])
-        pen_up_count = len(self.instructions) - pen_down_count
+        pen_down_count = int(self.pen.sum())
+        pen_up_count = len(self.pen) - pen_down_count
         
-        x_coords = [inst['x'] for inst in self.instructions]
-        y_coords = [inst['y'] for inst in self.instructions]
+        min_x, min_y = self.xy_steps.min(axis=0).tolist()
+        max_x, max_y = self.xy_steps.max(axis=0).tolist()
         
         stats = {
-            'total': len(self.instructions),
+            'total': len(self.pen),
             'pen_down': pen_down_count,
             'pen_up': pen_up_count,
-            'min_x': min(x_coords),
-            'max_x': max(x_coords),
-            'min_y': min(y_coords),
-            'max_y': max(y_coords),
-            'width': max(x_coords) - min(x_coords),
-            'height': max(y_coords) - min(y_coords)
+            'min_x': min_x,
+            'max_x': max_x,
+            'min_y': min_y,
+            'max_y': max_y,
+            'width': max_x - min_x,
+            'height': max_y - min_y
         }
         
         print("📊 Instruction Analysis:")
@@ -65,7 +105,8 @@ class PlotterSimulator:
         
         return stats
     
-    def plot(self, show_travel=True, show_grid=True, show_plate=True, steps_per_mm=10.0):
+    def plot(self, show_travel=True, show_grid=True, show_plate=True, steps_per_mm=10.0,
+             dpi=150, fmt='png'):
         """
         Plot the instructions - Standard view with pen up/down
         
@@ -74,70 +115,53 @@ class PlotterSimulator:
             show_grid: Show grid lines
             show_plate: Show plate boundary (220mm circle)
             steps_per_mm: Motor steps per mm for scale conversion
+            dpi: Raster resolution of the saved file (300 for publication)
+            fmt: Output format / file extension ('png', 'svg', 'pdf')
         """
         print("🎨 Generating standard visualization...")
         
         # Create figure
         fig, ax = plt.subplots(figsize=(12, 12))
         
-        # Convert steps to mm for display
-        instructions_mm = [
-            {
-                'x': inst['x'] / steps_per_mm,
-                'y': inst['y'] / steps_per_mm,
-                'penDown': inst['penDown']
-            }
-            for inst in self.instructions
-        ]
-        
-        # Separate pen-down and pen-up segments
-        current_segment = []
+        # Convert steps to mm for display (one vectorized divide)
+        xy_mm = self.xy_steps / steps_per_mm
+        
+        # Separate pen-down and pen-up segments: split where the pen state
+        # changes, each segment starting at the previous one's last point.
+        # Segments are views into xy_mm.
+        changes = np.flatnonzero(np.diff(self.pen)) + 1
+        starts = np.r_[0, changes - 1]
+        ends = np.r_[changes, len(xy_mm)]
         pen_down_segments = []
         pen_up_segments = []
         
-        for i, inst in enumerate(instructions_mm):
-            current_segment.append((inst['x'], inst['y']))
-            
-            # When pen state changes or end of instructions
-            if i < len(instructions_mm) - 1:
-                next_inst = instructions_mm[i + 1]
-                if inst['penDown'] != next_inst['penDown']:
-                    # Segment complete
-                    if inst['penDown']:
-                        pen_down_segments.append(current_segment[:])
-                    else:
-                        pen_up_segments.append(current_segment[:])
-                    current_segment = [current_segment[-1]]  # Start next segment at current point
+        for start, end, down in zip(starts.tolist(), ends.tolist(), self.pen[ends - 1].tolist()):
+            if down:
+                pen_down_segments.append(xy_mm[start:end])
             else:
-                # Last instruction
-                if inst['penDown']:
-                    pen_down_segments.append(current_segment)
-                else:
-                    pen_up_segments.append(current_segment)
-        
-        # Plot pen-down segments (drawing - red/sauce color)
-        for segment in pen_down_segments:
-            if len(segment) > 1:
-                xs, ys = zip(*segment)
-                ax.plot(xs, ys, 'r-', linewidth=2.5, label='Drawing (pen down)', 
-                       solid_capstyle='round', zorder=3)
+                pen_up_segments.append(xy_mm[start:end])
+        
+        # Plot pen-down segments (drawing - red/sauce color), one artist for all
+        ax.add_collection(LineCollection(
+            [segment for segment in pen_down_segments if len(segment) > 1],
+            colors='r', linewidths=2.5, capstyle='round', joinstyle='round',
+            label='Drawing (pen down)', zorder=3))
         
         # Plot pen-up segments (travel - blue dashed)
         if show_travel:
-            for segment in pen_up_segments:
-                if len(segment) > 1:
-                    xs, ys = zip(*segment)
-                    ax.plot(xs, ys, 'b--', linewidth=1.0, alpha=0.5, 
-                           label='Travel (pen up)', zorder=2)
+            ax.add_collection(LineCollection(
+                [segment for segment in pen_up_segments if len(segment) > 1],
+                colors='b', linestyles='--', linewidths=1.0, alpha=0.5,
+                label='Travel (pen up)', zorder=2))
         
         # Mark start point (green)
-        start = instructions_mm[0]
-        ax.plot(start['x'], start['y'], 'go', markersize=12, 
+        start = xy_mm[0]
+        ax.plot(start[0], start[1], 'go', markersize=12, 
                label='Start', zorder=5, markeredgecolor='darkgreen', markeredgewidth=2)
         
         # Mark end point (black)
-        end = instructions_mm[-1]
-        ax.plot(end['x'], end['y'], 'ko', markersize=12, 
+        end = xy_mm[-1]
+        ax.plot(end[0], end[1], 'ko', markersize=12, 
                label='End', zorder=5, markeredgecolor='white', markeredgewidth=2)
         
         # Show plate boundary (220mm diameter circle centered at origin)
@@ -173,11 +197,10 @@ class PlotterSimulator:
             ax.set_xlim(-120, 120)
             ax.set_ylim(-120, 120)
         else:
-            all_x = [inst['x'] for inst in instructions_mm]
-            all_y = [inst['y'] for inst in instructions_mm]
+            (min_x, min_y), (max_x, max_y) = xy_mm.min(axis=0), xy_mm.max(axis=0)
             padding = 20  # mm
-            ax.set_xlim(min(all_x) - padding, max(all_x) + padding)
-            ax.set_ylim(min(all_y) - padding, max(all_y) + padding)
+            ax.set_xlim(min_x - padding, max_x + padding)
+            ax.set_ylim(min_y - padding, max_y + padding)
         
         # Remove duplicate labels in legend
         handles, labels = ax.get_legend_handles_labels()
@@ -187,9 +210,9 @@ class PlotterSimulator:
         
         # Add info text
         info_text = (
-            f"Total moves: {len(self.instructions)}\n"
-            f"Drawing: {sum(1 for i in instructions_mm if i['penDown'])} moves\n"
-            f"Travel: {sum(1 for i in instructions_mm if not i['penDown'])} moves"
+            f"Total moves: {len(self.pen)}\n"
+            f"Drawing: {int(self.pen.sum())} moves\n"
+            f"Travel: {len(self.pen) - int(self.pen.sum())} moves"
         )
         ax.text(0.02, 0.98, info_text, transform=ax.transAxes,
                fontsize=11, verticalalignment='top',
@@ -198,50 +221,41 @@ class PlotterSimulator:
         plt.tight_layout()
         
         # Save figure
-        output_file = self.instructions_file.parent / "simulation_preview.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        output_file = self.instructions_file.parent / f"simulation_preview.{fmt}"
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"💾 Saved visualization to: {output_file}")
         
         return fig, ax
     
-    def plot_time_sequence(self, steps_per_mm=10.0):
+    def plot_time_sequence(self, steps_per_mm=10.0, dpi=150, fmt='png'):
         """
         Create a time-sequence visualization showing drawing order
         Uses color gradient to show the drawing sequence
+        
+        Args:
+            steps_per_mm: Motor steps per mm for scale conversion
+            dpi: Raster resolution of the saved file (300 for publication)
+            fmt: Output format / file extension ('png', 'svg', 'pdf')
         """
         print("🎨 Generating time-sequence visualization...")
         
         fig, ax = plt.subplots(figsize=(12, 12))
         
-        # Convert to mm
-        instructions_mm = [
-            {
-                'x': inst['x'] / steps_per_mm,
-                'y': inst['y'] / steps_per_mm,
-                'penDown': inst['penDown']
-            }
-            for inst in self.instructions
-        ]
+        # Convert to mm (one vectorized divide)
+        xy_mm = self.xy_steps / steps_per_mm
         
         # Create colormap from blue (start) to red (end)
         colors = ['blue', 'cyan', 'green', 'yellow', 'orange', 'red']
         n_bins = 100
         cmap = LinearSegmentedColormap.from_list('drawing_time', colors, N=n_bins)
         
-        # Plot each segment with time-based color
-        for i in range(len(instructions_mm) - 1):
-            curr = instructions_mm[i]
-            next_inst = instructions_mm[i + 1]
-            
-            if curr['penDown']:
-                # Calculate time fraction (0 to 1)
-                time_fraction = i / len(instructions_mm)
-                color = cmap(time_fraction)
-                
-                ax.plot([curr['x'], next_inst['x']], 
-                       [curr['y'], next_inst['y']], 
-                       color=color, linewidth=2.5, 
-                       solid_capstyle='round', zorder=3)
+        # Plot each pen-down move with time-based color (one artist; the
+        # colormap lookup happens inside matplotlib)
+        drawn = np.flatnonzero(self.pen[:-1])
+        moves = np.stack((xy_mm[drawn], xy_mm[drawn + 1]), axis=1)
+        ax.add_collection(LineCollection(
+            moves, array=drawn / len(self.pen), cmap=cmap, norm=plt.Normalize(0, 1),
+            linewidths=2.5, capstyle='round', zorder=3))
         
         # Add colorbar to show time
         sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(0, 1))
@@ -250,11 +264,11 @@ class PlotterSimulator:
         cbar.set_label('Drawing Progress (Start → End)', fontsize=12, fontweight='bold')
         
         # Mark start and end
-        start = instructions_mm[0]
-        end = instructions_mm[-1]
-        ax.plot(start['x'], start['y'], 'o', color='blue', markersize=15, 
+        start = xy_mm[0]
+        end = xy_mm[-1]
+        ax.plot(start[0], start[1], 'o', color='blue', markersize=15, 
                label='Start', zorder=5, markeredgecolor='white', markeredgewidth=2)
-        ax.plot(end['x'], end['y'], 'o', color='red', markersize=15, 
+        ax.plot(end[0], end[1], 'o', color='red', markersize=15, 
                label='End', zorder=5, markeredgecolor='white', markeredgewidth=2)
         
         # Show plate boundary
@@ -277,8 +291,8 @@ class PlotterSimulator:
         plt.tight_layout()
         
         # Save
-        output_file = self.instructions_file.parent / "simulation_sequence.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        output_file = self.instructions_file.parent / f"simulation_sequence.{fmt}"
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"💾 Saved sequence visualization to: {output_file}")
         
         return fig, ax
@@ -291,9 +305,16 @@ def main():
     print("=" * 70)
     print()
     
+    # 150 dpi PNGs by default; --publication renders at 300 dpi and
+    # --svg writes vector files instead (dpi then only affects rasterized art)
+    flags = [arg for arg in sys.argv[1:] if arg in ('--publication', '--svg')]
+    args = [arg for arg in sys.argv[1:] if arg not in flags]
+    dpi = 300 if '--publication' in flags else 150
+    fmt = 'svg' if '--svg' in flags else 'png'
+    
     # Get instructions file
-    if len(sys.argv) > 1:
-        instructions_file = sys.argv[1]
+    if args:
+        instructions_file = args[0]
     else:
         # Default to test output
         instructions_file = Path(__file__).parent / "test_output_instructions.json"
@@ -301,10 +322,12 @@ def main():
     if not Path(instructions_file).exists():
         print(f"❌ Error: Instructions file not found: {instructions_file}")
         print()
-        print("Usage: python plot_simulator.py [instructions.json]")
+        print("Usage: python plot_simulator.py [instructions.json | instructions.npz] [--publication] [--svg]")
         print()
         print("Example:")
         print("  python plot_simulator.py test_output_instructions.json")
+        print("  python plot_simulator.py test_output_instructions.npz --publication")
+        print("  python plot_simulator.py test_output_instructions.json --svg")
         return
     
     # Create simulator
@@ -315,11 +338,12 @@ def main():
     
     # Plot standard view
     print("Creating standard visualization...")
-    fig1, ax1 = sim.plot(show_travel=True, show_grid=True, show_plate=True, steps_per_mm=10.0)
+    fig1, ax1 = sim.plot(show_travel=True, show_grid=True, show_plate=True, steps_per_mm=10.0,
+                         dpi=dpi, fmt=fmt)
     
     # Plot time-sequence view
     print("Creating time-sequence visualization...")
-    fig2, ax2 = sim.plot_time_sequence(steps_per_mm=10.0)
+    fig2, ax2 = sim.plot_time_sequence(steps_per_mm=10.0, dpi=dpi, fmt=fmt)
     
     print()
     print("=" * 70)
@@ -327,8 +351,8 @@ def main():
     print("=" * 70)
     print()
     print("Two visualizations created:")
-    print("  1. simulation_preview.png - Standard view with pen up/down")
-    print("  2. simulation_sequence.png - Time-based color gradient")
+    print(f"  1. simulation_preview.{fmt} - Standard view with pen up/down")
+    print(f"  2. simulation_sequence.{fmt} - Time-based color gradient")
     print()
     print("📺 Displaying plots...")
     plt.show()
@@ -6,13 +6,99 @@ Shows G1 paths (drawing with sauce) and G0 paths (rapid travel) in different col
 Works with the new SSG-based motor control system
 """
 
+import contextlib
+import io
+import os
 import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+
+# Save-only runs (--no-show, or CI) skip the interactive backend's start-up;
+# this has to happen before pyplot is imported
+if __name__ == "__main__" and ('--no-show' in sys.argv or os.environ.get('CI')):
+    matplotlib.use('Agg')
+
 import matplotlib.pyplot as plt
 import matplotlib.patches as patches
 from pathlib import Path
-import sys
 import numpy as np
+from matplotlib.collections import LineCollection
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.lines import Line2D
+
+# SSG line grammar (compiled once): optional N<seq>, command letter + number,
+# then X/Y/F/S parameters
+_CMD_RE = re.compile(r'^(?:N\d+\s+)?([GM])(\d+)')
+_PARAM_RE = re.compile(r'([XYFS])([-+]?\d*\.?\d+)')
+
+# Whole-file form of the same grammar over the raw bytes: one match per
+# command line with the first X and Y (if any) picked out by lookaheads,
+# as parse_ssg_command does
+_LINE_RE = re.compile(
+    rb'^[ \t]*(?:N\d+[ \t]+)?([GM])(\d+)'
+    rb'(?=(?:.*?X([-+]?\d*\.?\d+))?)(?=(?:.*?Y([-+]?\d*\.?\d+))?)',
+    re.MULTILINE,
+)
+_COMMAND_LINE_RE = re.compile(rb'^[ \t]*\S', re.MULTILINE)  # Any non-blank line
+
+
+# Backends that only write files (no window to show figures in)
+_HEADLESS_BACKENDS = ('agg', 'cairo', 'pdf', 'pgf', 'ps', 'svg', 'template')
+
+
+def _forward_fill(values, valid):
+    """Replace each invalid entry with the last valid one before it (values[0] must be valid)"""
+    idx = np.where(valid, np.arange(len(values)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    return values[idx]
+
+
+def _mark_endpoints(ax, positions, colors, edgecolors, markersize):
+    """
+    Draw the start and end markers as a single scatter artist
+    
+    Returns:
+        Legend handles for 'Start' and 'End' (proxies, not added to the axes)
+    """
+    ax.scatter(positions[[0, -1], 0], positions[[0, -1], 1], c=colors,
+               s=markersize ** 2, edgecolors=edgecolors, linewidths=2, zorder=5)
+    return [
+        Line2D([], [], linestyle='none', marker='o', markersize=markersize, color=color,
+               markeredgecolor=edgecolor, markeredgewidth=2, label=label)
+        for label, color, edgecolor in zip(('Start', 'End'), colors, edgecolors)
+    ]
+
+
+def _lttb(points, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling of an (N, 2) polyline
+    
+    Keeps the first and last vertex and, from each of n_out - 2 equal index
+    buckets in between, the vertex forming the largest triangle with the
+    previously kept vertex and the next bucket's centroid.
+    """
+    n = len(points)
+    if n_out >= n:
+        return points
+    if n_out < 3:
+        return points[[0, -1]]
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    ax, ay = points[0]
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 2 < len(edges):
+            cx, cy = points[hi:edges[b + 2]].mean(axis=0)
+        else:
+            cx, cy = points[-1]
+        bucket = points[lo:hi]
+        area = np.abs((ax - cx) * (bucket[:, 1] - ay) - (ax - bucket[:, 0]) * (cy - ay))
+        keep[b + 1] = lo + int(area.argmax())
+        ax, ay = points[keep[b + 1]]
+    return points[keep]
 
 
 class SSGSimulator:
@@ -21,109 +107,133 @@ class SSGSimulator:
     def __init__(self, ssg_file):
         """Initialize simulator with SSG file"""
         self.ssg_file = Path(ssg_file)
-        self.commands = []
-        self.positions = []  # List of (x, y, is_drawing) tuples
+        self.command_count = 0
+        self._ssg_bytes = b''  # Raw file contents, scanned once by simulate()
+        self.positions = np.empty((0, 3))  # (N, 3) rows of x, y, is_drawing (0/1)
+        self._draw_mask = np.empty(0, dtype=bool)  # positions[:, 2] as bool
+        self._stats = None  # analyze() result for the current positions
+        
+        # Parsed positions are cached next to the SSG file, keyed by mtime + size
+        self.cache_file = self.ssg_file.with_name(self.ssg_file.name + '.npz')
+        self._cache_key = None
+        self._cached = False
         self.load_ssg()
     
     def load_ssg(self):
-        """Load SSG commands from file"""
+        """Load SSG commands from file (or the parse cache if still current)"""
         print(f"📄 Loading SSG from: {self.ssg_file}")
         
-        with open(self.ssg_file, 'r') as f:
-            self.commands = [line.strip() for line in f if line.strip()]
+        stat = self.ssg_file.stat()
+        self._cache_key = np.array([stat.st_mtime_ns, stat.st_size], dtype=np.int64)
+        if self._load_cache():
+            print(f"✓ Loaded {self.command_count} commands (cached: {self.cache_file.name})")
+            print()
+            return
+        
+        # One bytes read for the whole file: SSG is ASCII, so the patterns
+        # scan it as-is (no text decode, no per-line objects)
+        self._ssg_bytes = self.ssg_file.read_bytes()
+        self.command_count = len(_COMMAND_LINE_RE.findall(self._ssg_bytes))
         
-        print(f"✓ Loaded {len(self.commands)} commands")
+        print(f"✓ Loaded {self.command_count} commands")
         print()
     
+    def _load_cache(self):
+        """Restore simulated positions from the .npz cache if it matches the SSG file"""
+        try:
+            with np.load(self.cache_file) as data:
+                if not np.array_equal(data['meta'], self._cache_key):
+                    return False
+                self._set_positions(data['positions'])
+                self.command_count = int(data['count'])
+        except (OSError, KeyError, ValueError):
+            return False
+        
+        self._cached = True
+        return True
+    
+    def _set_positions(self, positions):
+        """Install simulated positions and the values derived from them"""
+        self.positions = positions
+        self._draw_mask = positions[:, 2] != 0
+        self._stats = None
+    
+    def _save_cache(self):
+        """Write simulated positions to the .npz cache (skipped if not writable)"""
+        try:
+            np.savez(self.cache_file, positions=self.positions,
+                     count=self.command_count, meta=self._cache_key)
+        except OSError:
+            pass
+    
     def parse_ssg_command(self, line):
         """Parse a single SSG command line"""
-        # Remove sequence number if present (N123)
-        if line.startswith('N'):
-            parts = line.split(' ', 1)
-            if len(parts) > 1:
-                line = parts[1]
-        
-        # Parse command type
-        cmd_match = re.match(r'^([GM])(\d+)', line)
+        # Command type (sequence number N123 is skipped by the pattern)
+        cmd_match = _CMD_RE.match(line)
         if not cmd_match:
             return None
         
-        cmd_type = cmd_match.group(1)
-        cmd_num = int(cmd_match.group(2))
-        
-        # Parse parameters
-        params = {}
-        
-        x_match = re.search(r'X([-+]?\d*\.?\d+)', line)
-        if x_match:
-            params['x'] = float(x_match.group(1))
-        
-        y_match = re.search(r'Y([-+]?\d*\.?\d+)', line)
-        if y_match:
-            params['y'] = float(y_match.group(1))
-        
-        f_match = re.search(r'F([-+]?\d*\.?\d+)', line)
-        if f_match:
-            params['f'] = float(f_match.group(1))
-        
-        s_match = re.search(r'S([-+]?\d*\.?\d+)', line)
-        if s_match:
-            params['s'] = float(s_match.group(1))
+        # Parameters in one scan; reversed so the first occurrence of a letter wins
+        params = {
+            letter.lower(): float(value)
+            for letter, value in reversed(_PARAM_RE.findall(line, cmd_match.end()))
+        }
         
         return {
-            'type': cmd_type,
-            'num': cmd_num,
+            'type': cmd_match.group(1),
+            'num': int(cmd_match.group(2)),
             'params': params
         }
     
     def simulate(self):
         """
         Simulate SSG commands to extract positions
-        Returns list of (x, y, is_drawing) tuples
+        Returns (N, 3) array of x, y, is_drawing (0/1) rows
+        
+        The whole file is tokenized in one regex pass and the machine
+        state (position, sauce on/off) is carried forward with array ops
+        instead of a per-command interpreter loop.
         """
         print("🎮 Simulating SSG commands...")
         
-        current_x = 0.0
-        current_y = 0.0
-        sauce_on = False
-        positions = []
-        
-        # Add starting position
-        positions.append((current_x, current_y, False))
-        
-        for cmd_line in self.commands:
-            cmd = self.parse_ssg_command(cmd_line)
-            
-            if not cmd:
-                continue
-            
-            if cmd['type'] == 'G':
-                if cmd['num'] == 0:  # G0 - Rapid (sauce off)
-                    if 'x' in cmd['params']:
-                        current_x = cmd['params']['x']
-                    if 'y' in cmd['params']:
-                        current_y = cmd['params']['y']
-                    positions.append((current_x, current_y, False))
-                
-                elif cmd['num'] == 1:  # G1 - Linear (drawing)
-                    if 'x' in cmd['params']:
-                        current_x = cmd['params']['x']
-                    if 'y' in cmd['params']:
-                        current_y = cmd['params']['y']
-                    positions.append((current_x, current_y, sauce_on))
-                
-                elif cmd['num'] == 28:  # G28 - Home
-                    current_x = 0.0
-                    current_y = 0.0
-                    positions.append((current_x, current_y, False))
-            
-            elif cmd['type'] == 'M':
-                if cmd['num'] == 3:  # M3 - Sauce on
-                    sauce_on = True
-                elif cmd['num'] == 5:  # M5 - Sauce off
-                    sauce_on = False
-        
-        self.positions = positions
+        if self._cached:
+            print(f"✓ Simulated {len(self.positions)} positions (cached)")
+            print()
+            return self.positions
+        
+        table = _LINE_RE.findall(self._ssg_bytes)
+        letter, num, x_col, y_col = zip(*table) if table else ((), (), (), ())
+        is_g = np.array(letter, dtype=bytes) == b'G'
+        num = np.fromiter(map(int, num), dtype=np.int64, count=len(num))
+        
+        # Sauce state after each command: the last M3 (on) / M5 (off) so far
+        sauce_event = np.full(len(num) + 1, -1)
+        sauce_event[0] = 0
+        sauce_event[1:][~is_g & (num == 3)] = 1
+        sauce_event[1:][~is_g & (num == 5)] = 0
+        sauce_on = _forward_fill(sauce_event, sauce_event >= 0)[1:] == 1
+        
+        # Only G0 (rapid), G1 (linear) and G28 (home) emit positions
+        moves = is_g & ((num == 0) | (num == 1) | (num == 28))
+        rows = np.flatnonzero(moves)
+        num = num[moves]
+        
+        # Target coordinates, with missing axes keeping the previous value
+        axes = []
+        for col in (x_col, y_col):
+            values = np.empty(len(rows) + 1)
+            values[0] = 0.0  # Starting position
+            values[1:] = [float(col[i]) if col[i] else np.nan for i in rows.tolist()]
+            values[1:][num == 28] = 0.0  # Home
+            axes.append(_forward_fill(values, ~np.isnan(values)))
+        
+        positions = np.empty((len(num) + 1, 3))
+        positions[:, 0], positions[:, 1] = axes
+        positions[0, 2] = 0.0
+        positions[1:, 2] = (num == 1) & sauce_on[moves]  # Only G1 draws
+        
+        self._set_positions(positions)
+        self._save_cache()
         print(f"✓ Simulated {len(positions)} positions")
         print()
         
@@ -131,26 +241,29 @@ class SSGSimulator:
     
     def analyze(self):
         """Analyze the simulated path"""
-        if not self.positions:
+        if not len(self.positions):
             return
         
-        drawing_count = sum(1 for _, _, is_drawing in self.positions if is_drawing)
-        travel_count = len(self.positions) - drawing_count
-        
-        x_coords = [x for x, _, _ in self.positions]
-        y_coords = [y for _, y, _ in self.positions]
-        
-        stats = {
-            'total': len(self.positions),
-            'drawing': drawing_count,
-            'travel': travel_count,
-            'min_x': min(x_coords),
-            'max_x': max(x_coords),
-            'min_y': min(y_coords),
-            'max_y': max(y_coords),
-            'width': max(x_coords) - min(x_coords),
-            'height': max(y_coords) - min(y_coords)
-        }
+        if self._stats is None:
+            drawing_count = int(self._draw_mask.sum())
+            travel_count = len(self.positions) - drawing_count
+            
+            # Column reductions over the position array (no per-row unpacking)
+            min_x, min_y = self.positions[:, :2].min(axis=0).tolist()
+            max_x, max_y = self.positions[:, :2].max(axis=0).tolist()
+            
+            self._stats = {
+                'total': len(self.positions),
+                'drawing': drawing_count,
+                'travel': travel_count,
+                'min_x': min_x,
+                'max_x': max_x,
+                'min_y': min_y,
+                'max_y': max_y,
+                'width': max_x - min_x,
+                'height': max_y - min_y
+            }
+        stats = self._stats
         
         print("📊 Path Analysis:")
         print(f"   Total positions: {stats['total']}")
@@ -164,7 +277,8 @@ class SSGSimulator:
         
         return stats
     
-    def plot(self, show_travel=True, show_grid=True, show_plate=True):
+    def plot(self, show_travel=True, show_grid=True, show_plate=True, dpi=150, fmt='png',
+             max_travel_vertices=5000):
         """
         Plot the simulated path - Standard view
         
@@ -172,64 +286,59 @@ class SSGSimulator:
             show_travel: Show rapid travel moves (G0)
             show_grid: Show grid lines
             show_plate: Show plate boundary (220mm circle)
+            dpi: Resolution of the saved file (and of the path lines in SVG/PDF)
+            fmt: Output format / file extension ('png', 'svg', 'pdf')
+            max_travel_vertices: Travel lines above this many vertices in total are
+                LTTB-downsampled to about this many (drawing lines are never reduced)
         """
         print("🎨 Generating standard visualization...")
         
-        if not self.positions:
+        if not len(self.positions):
             self.simulate()
         
         # Create figure
         fig, ax = plt.subplots(figsize=(12, 12))
         
-        # Separate drawing and travel segments
-        current_segment = []
+        # Separate drawing and travel segments: split where the drawing state
+        # changes, each segment starting at the previous one's last point.
+        # Segments are views into the position array.
+        xy = self.positions[:, :2]
+        drawing = self._draw_mask
+        changes = np.flatnonzero(np.diff(drawing)) + 1
+        starts = np.r_[0, changes - 1]
+        ends = np.r_[changes, len(xy)]
         drawing_segments = []
         travel_segments = []
         
-        for i, (x, y, is_drawing) in enumerate(self.positions):
-            current_segment.append((x, y))
-            
-            # When state changes or end of positions
-            if i < len(self.positions) - 1:
-                next_is_drawing = self.positions[i + 1][2]
-                if is_drawing != next_is_drawing:
-                    # Segment complete
-                    if is_drawing:
-                        drawing_segments.append(current_segment[:])
-                    else:
-                        travel_segments.append(current_segment[:])
-                    current_segment = [current_segment[-1]]  # Start next at current point
+        for start, end, is_drawing in zip(starts.tolist(), ends.tolist(), drawing[ends - 1].tolist()):
+            if is_drawing:
+                drawing_segments.append(xy[start:end])
             else:
-                # Last position
-                if is_drawing:
-                    drawing_segments.append(current_segment)
-                else:
-                    travel_segments.append(current_segment)
-        
-        # Plot drawing segments (G1 with sauce - red/sauce color)
-        for segment in drawing_segments:
-            if len(segment) > 1:
-                xs, ys = zip(*segment)
-                ax.plot(xs, ys, 'r-', linewidth=3.0, label='Drawing (G1, sauce on)', 
-                       solid_capstyle='round', zorder=3, alpha=0.8)
-        
-        # Plot travel segments (G0 rapid - blue dashed)
+                travel_segments.append(xy[start:end])
+        
+        # Plot drawing segments (G1 with sauce - red/sauce color), one artist for all
+        ax.add_collection(LineCollection(
+            [segment for segment in drawing_segments if len(segment) > 1],
+            colors='r', linewidths=3.0, capstyle='round', joinstyle='round', alpha=0.8,
+            label='Drawing (G1, sauce on)', zorder=3, rasterized=True))
+        
+        # Plot travel segments (G0 rapid - blue dashed), thinned out when
+        # there are too many vertices to tell apart
         if show_travel:
-            for segment in travel_segments:
-                if len(segment) > 1:
-                    xs, ys = zip(*segment)
-                    ax.plot(xs, ys, 'b--', linewidth=1.0, alpha=0.5, 
-                           label='Travel (G0, rapid)', zorder=2)
-        
-        # Mark start point (green)
-        start_x, start_y, _ = self.positions[0]
-        ax.plot(start_x, start_y, 'go', markersize=12, 
-               label='Start', zorder=5, markeredgecolor='darkgreen', markeredgewidth=2)
-        
-        # Mark end point (black)
-        end_x, end_y, _ = self.positions[-1]
-        ax.plot(end_x, end_y, 'ko', markersize=12, 
-               label='End', zorder=5, markeredgecolor='white', markeredgewidth=2)
+            travel_segments = [segment for segment in travel_segments if len(segment) > 1]
+            travel_vertices = sum(len(segment) for segment in travel_segments)
+            if travel_vertices > max_travel_vertices:
+                keep = max_travel_vertices / travel_vertices
+                travel_segments = [_lttb(segment, max(2, int(len(segment) * keep)))
+                                   for segment in travel_segments]
+            ax.add_collection(LineCollection(
+                travel_segments,
+                colors='b', linestyles='--', linewidths=1.0, alpha=0.5,
+                label='Travel (G0, rapid)', zorder=2, rasterized=True))
+        
+        # Mark start (green) and end (black) points
+        endpoint_handles = _mark_endpoints(ax, self.positions, ['green', 'black'],
+                                           ['darkgreen', 'white'], markersize=12)
         
         # Show plate boundary (220mm diameter circle centered at origin)
         if show_plate:
@@ -264,22 +373,25 @@ class SSGSimulator:
             ax.set_xlim(-120, 120)
             ax.set_ylim(-120, 120)
         else:
-            all_x = [x for x, _, _ in self.positions]
-            all_y = [y for _, y, _ in self.positions]
+            (min_x, min_y), (max_x, max_y) = self.positions[:, :2].min(axis=0), self.positions[:, :2].max(axis=0)
             padding = 20  # mm
-            ax.set_xlim(min(all_x) - padding, max(all_x) + padding)
-            ax.set_ylim(min(all_y) - padding, max(all_y) + padding)
+            ax.set_xlim(min_x - padding, max_x + padding)
+            ax.set_ylim(min_y - padding, max_y + padding)
         
         # Remove duplicate labels in legend
+        # (start/end markers listed after the lines, as when they were drawn)
         handles, labels = ax.get_legend_handles_labels()
+        n_lines = sum(isinstance(h, LineCollection) for h in handles)
+        handles[n_lines:n_lines] = endpoint_handles
+        labels[n_lines:n_lines] = [h.get_label() for h in endpoint_handles]
         by_label = dict(zip(labels, handles))
         ax.legend(by_label.values(), by_label.keys(), 
                  loc='upper right', fontsize=11, framealpha=0.95)
         
         # Add info text
-        drawing_count = sum(1 for _, _, is_drawing in self.positions if is_drawing)
+        drawing_count = int(self._draw_mask.sum())
         info_text = (
-            f"Total SSG commands: {len(self.commands)}\n"
+            f"Total SSG commands: {self.command_count}\n"
             f"Positions: {len(self.positions)}\n"
             f"Drawing: {drawing_count} positions\n"
             f"Travel: {len(self.positions) - drawing_count} positions"
@@ -291,20 +403,24 @@ class SSGSimulator:
         plt.tight_layout()
         
         # Save figure
-        output_file = self.ssg_file.parent / "simulation_preview.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        output_file = self.ssg_file.parent / f"simulation_preview.{fmt}"
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"💾 Saved visualization to: {output_file}")
         
         return fig, ax
     
-    def plot_time_sequence(self):
+    def plot_time_sequence(self, dpi=150, fmt='png'):
         """
         Create a time-sequence visualization showing drawing order
         Uses color gradient to show the drawing sequence
+        
+        Args:
+            dpi: Resolution of the saved file (and of the path lines in SVG/PDF)
+            fmt: Output format / file extension ('png', 'svg', 'pdf')
         """
         print("🎨 Generating time-sequence visualization...")
         
-        if not self.positions:
+        if not len(self.positions):
             self.simulate()
         
         fig, ax = plt.subplots(figsize=(12, 12))
@@ -314,19 +430,14 @@ class SSGSimulator:
         n_bins = 100
         cmap = LinearSegmentedColormap.from_list('drawing_time', colors, N=n_bins)
         
-        # Plot each segment with time-based color
-        for i in range(len(self.positions) - 1):
-            x1, y1, is_drawing1 = self.positions[i]
-            x2, y2, is_drawing2 = self.positions[i + 1]
-            
-            if is_drawing1 or is_drawing2:
-                # Calculate time fraction (0 to 1)
-                time_fraction = i / len(self.positions)
-                color = cmap(time_fraction)
-                
-                ax.plot([x1, x2], [y1, y2], 
-                       color=color, linewidth=2.5, 
-                       solid_capstyle='round', zorder=3)
+        # Plot each segment touching a drawing position with time-based color
+        # (one artist; the colormap lookup happens inside matplotlib)
+        drawing = self._draw_mask
+        moves = np.flatnonzero(drawing[:-1] | drawing[1:])
+        segments = np.stack((self.positions[moves, :2], self.positions[moves + 1, :2]), axis=1)
+        ax.add_collection(LineCollection(
+            segments, array=moves / len(self.positions), cmap=cmap, norm=plt.Normalize(0, 1),
+            linewidths=2.5, capstyle='round', zorder=3, rasterized=True))
         
         # Add colorbar to show time
         sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(0, 1))
@@ -335,12 +446,8 @@ class SSGSimulator:
         cbar.set_label('Drawing Progress (Start → End)', fontsize=12, fontweight='bold')
         
         # Mark start and end
-        start_x, start_y, _ = self.positions[0]
-        end_x, end_y, _ = self.positions[-1]
-        ax.plot(start_x, start_y, 'o', color='blue', markersize=15, 
-               label='Start', zorder=5, markeredgecolor='white', markeredgewidth=2)
-        ax.plot(end_x, end_y, 'o', color='red', markersize=15, 
-               label='End', zorder=5, markeredgecolor='white', markeredgewidth=2)
+        endpoint_handles = _mark_endpoints(ax, self.positions, ['blue', 'red'],
+                                           ['white', 'white'], markersize=15)
         
         # Show plate boundary
         plate_radius = 110
@@ -357,18 +464,39 @@ class SSGSimulator:
         ax.grid(True, alpha=0.3)
         ax.set_xlim(-120, 120)
         ax.set_ylim(-120, 120)
-        ax.legend(loc='upper right', fontsize=11, framealpha=0.95)
+        handles, _ = ax.get_legend_handles_labels()
+        ax.legend(handles=endpoint_handles + handles, loc='upper right', fontsize=11, framealpha=0.95)
         
         plt.tight_layout()
         
         # Save
-        output_file = self.ssg_file.parent / "simulation_sequence.png"
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        output_file = self.ssg_file.parent / f"simulation_sequence.{fmt}"
+        plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
         print(f"💾 Saved sequence visualization to: {output_file}")
         
         return fig, ax
 
 
+def _render_in_worker(ssg_file, method, kwargs):
+    """
+    Process-pool job: build and save one figure headlessly
+    
+    The positions come from the .npz parse cache written by the parent's
+    simulate(), so the worker does not re-parse the SSG file.
+    
+    Returns:
+        The console output of the plot call, for the parent to print in order
+    """
+    plt.switch_backend('Agg')
+    with contextlib.redirect_stdout(io.StringIO()):
+        sim = SSGSimulator(ssg_file)
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        getattr(sim, method)(**kwargs)
+    plt.close('all')
+    return output.getvalue()
+
+
 def main():
     """Main function"""
     print("=" * 70)
@@ -376,9 +504,12 @@ def main():
     print("=" * 70)
     print()
     
+    # --no-show only saves the PNGs (the backend was already chosen at import)
+    args = [arg for arg in sys.argv[1:] if arg != '--no-show']
+    
     # Get SSG file
-    if len(sys.argv) > 1:
-        ssg_file = sys.argv[1]
+    if args:
+        ssg_file = args[0]
     else:
         # Default to test output
         ssg_file = Path(__file__).parent / "test_output.ssg"
@@ -386,11 +517,11 @@ def main():
     if not Path(ssg_file).exists():
         print(f"❌ Error: SSG file not found: {ssg_file}")
         print()
-        print("Usage: python ssg_simulator.py [file.ssg]")
+        print("Usage: python ssg_simulator.py [file.ssg] [--no-show]")
         print()
         print("Example:")
         print("  python ssg_simulator.py ../motor_movement/test_square_output.ssg")
-        print("  python ssg_simulator.py test_output.ssg")
+        print("  python ssg_simulator.py test_output.ssg --no-show")
         return
     
     # Create simulator
@@ -402,13 +533,25 @@ def main():
     # Analyze
     sim.analyze()
     
-    # Plot standard view
-    print("Creating standard visualization...")
-    fig1, ax1 = sim.plot(show_travel=True, show_grid=True, show_plate=True)
+    figures = [
+        ('standard', 'plot', {'show_travel': True, 'show_grid': True, 'show_plate': True}),
+        ('time-sequence', 'plot_time_sequence', {}),
+    ]
+    headless = plt.get_backend().lower() in _HEADLESS_BACKENDS
     
-    # Plot time-sequence view
-    print("Creating time-sequence visualization...")
-    fig2, ax2 = sim.plot_time_sequence()
+    if headless and (os.cpu_count() or 1) > 1:
+        # Nothing to display: render both figures in parallel worker processes
+        print("Creating standard and time-sequence visualizations in parallel...")
+        with ProcessPoolExecutor(max_workers=len(figures)) as pool:
+            jobs = [pool.submit(_render_in_worker, sim.ssg_file, method, kwargs)
+                    for _, method, kwargs in figures]
+            for job in jobs:
+                print(job.result(), end='')
+    else:
+        # Single core, or figures needed in this process for plt.show()
+        for name, method, kwargs in figures:
+            print(f"Creating {name} visualization...")
+            getattr(sim, method)(**kwargs)
     
     print()
     print("=" * 70)
@@ -419,8 +562,9 @@ def main():
     print("  1. simulation_preview.png - Standard view with sauce on/off")
     print("  2. simulation_sequence.png - Time-based color gradient")
     print()
-    print("📺 Displaying plots...")
-    plt.show()
+    if not headless:
+        print("📺 Displaying plots...")
+        plt.show()
 
 
 if __name__ == "__main__":
@@ -7,8 +7,25 @@ Tests the conversion pipeline with best_result.svg
 import sys
 import json
 import asyncio
+from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson  # Optional: C-accelerated instruction (de)serialization
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj):
+        """Compact JSON text (orjson never emits whitespace)"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _json_loads = json.loads
+    
+    def _json_dumps(obj):
+        """Compact JSON text"""
+        return json.dumps(obj, separators=(',', ':'))
+
 # Add the motor_movement directory to path
 sys.path.insert(0, str(Path(__file__).parent / "shyla_motor_code" / "motor_movement"))
 
@@ -60,7 +77,39 @@ def test_svg_parsing():
     return converter
 
 
-def analyze_path_data(converter):
+@dataclass(slots=True)
+class PathArrays:
+    """Structure-of-arrays copy of the converter's point list"""
+    xy: np.ndarray     # (N, 2) point coordinates
+    pen: np.ndarray    # pen_down per point
+    steps: np.ndarray  # Length of the move into each point after the first
+    
+    def bounds(self):
+        """Drawing bounds, same keys as converter.get_bounds()"""
+        (min_x, min_y), (max_x, max_y) = self.xy.min(axis=0).tolist(), self.xy.max(axis=0).tolist()
+        return {
+            'min_x': min_x,
+            'min_y': min_y,
+            'max_x': max_x,
+            'max_y': max_y,
+            'width': max_x - min_x,
+            'height': max_y - min_y,
+        }
+
+
+def path_arrays(converter):
+    """Copy the converter's point list into arrays once (after centering)"""
+    xy = np.array(
+        [(p.x, p.y) for p in converter.path_data], dtype=np.float64
+    ).reshape(-1, 2)
+    pen = np.fromiter(
+        (p.pen_down for p in converter.path_data), dtype=bool, count=len(converter.path_data)
+    )
+    steps = np.hypot(*np.diff(xy, axis=0).T)
+    return PathArrays(xy, pen, steps)
+
+
+def analyze_path_data(arrays):
     """Analyze the converted path data"""
     print("=" * 70)
     print("PATH ANALYSIS")
@@ -68,7 +117,7 @@ def analyze_path_data(converter):
     print()
     
     # Get bounds
-    bounds = converter.get_bounds()
+    bounds = arrays.bounds()
     print(f"📏 Drawing Bounds:")
     print(f"   Min X: {bounds['min_x']:.2f} units")
     print(f"   Min Y: {bounds['min_y']:.2f} units")
@@ -79,31 +128,20 @@ def analyze_path_data(converter):
     print()
     
     # Count pen up/down movements
-    pen_down_count = sum(1 for p in converter.path_data if p.pen_down)
-    pen_up_count = len(converter.path_data) - pen_down_count
+    pen_down_count = int(arrays.pen.sum())
+    pen_up_count = len(arrays.pen) - pen_down_count
     
     print(f"✏️  Movement Statistics:")
     print(f"   Pen down moves: {pen_down_count}")
     print(f"   Pen up moves: {pen_up_count}")
-    print(f"   Total points: {len(converter.path_data)}")
+    print(f"   Total points: {len(arrays.pen)}")
     print()
     
-    # Calculate total path length
-    total_distance = 0.0
-    draw_distance = 0.0
-    travel_distance = 0.0
-    
-    for i in range(1, len(converter.path_data)):
-        prev = converter.path_data[i-1]
-        curr = converter.path_data[i]
-        dx = curr.x - prev.x
-        dy = curr.y - prev.y
-        dist = (dx**2 + dy**2) ** 0.5
-        total_distance += dist
-        if curr.pen_down:
-            draw_distance += dist
-        else:
-            travel_distance += dist
+    # Calculate total path length (each move counts as drawing if it ends pen-down)
+    moves_down = arrays.pen[1:]
+    draw_distance = float(arrays.steps[moves_down].sum())
+    travel_distance = float(arrays.steps[~moves_down].sum())
+    total_distance = draw_distance + travel_distance
     
     print(f"📐 Distance Analysis:")
     print(f"   Drawing distance: {draw_distance:.2f} units")
@@ -133,7 +171,7 @@ def show_motor_instructions(converter):
     print()
     
     instructions_json = converter.to_motor_instructions()
-    instructions = json.loads(instructions_json)
+    instructions = _json_loads(instructions_json)
     
     print(f"Total instructions: {len(instructions)}")
     print(f"JSON size: {len(instructions_json)} bytes")
@@ -148,15 +186,32 @@ def show_motor_instructions(converter):
         print(f"  ... ({len(instructions) - 10} more instructions)")
     print()
     
-    return instructions_json
+    return instructions
 
 
-def save_instructions(instructions_json):
-    """Save motor instructions to file"""
+def save_instructions(instructions):
+    """
+    Save motor instructions to file
+    
+    Returns:
+        The compact JSON text that was written (reused for the plotter upload)
+    """
     output_file = Path(__file__).parent / "test_output_instructions.json"
+    instructions_json = _json_dumps(instructions)
     output_file.write_text(instructions_json)
     print(f"💾 Saved instructions to: {output_file}")
+    
+    # Array sibling for plot_simulator.py (loads without a JSON reparse)
+    npz_file = output_file.with_suffix('.npz')
+    np.savez_compressed(
+        npz_file,
+        xy=np.array([(inst['x'], inst['y']) for inst in instructions], dtype=np.float32).reshape(-1, 2),
+        pen=np.array([inst['penDown'] for inst in instructions], dtype=bool),
+    )
+    print(f"💾 Saved instruction arrays to: {npz_file}")
     print()
+    
+    return instructions_json
 
 
 async def test_plotter_connection(instructions_json):
@@ -221,14 +276,14 @@ async def test_plotter_connection(instructions_json):
     print()
 
 
-def validate_svg_constraints(converter):
+def validate_svg_constraints(arrays):
     """Validate against design doc constraints"""
     print("=" * 70)
     print("DESIGN DOC CONSTRAINTS VALIDATION")
     print("=" * 70)
     print()
     
-    bounds = converter.get_bounds()
+    bounds = arrays.bounds()
     
     # Check size constraints
     max_dimension = 220  # mm from design doc
@@ -241,25 +296,15 @@ def validate_svg_constraints(converter):
     
     # Check path complexity
     max_points = 10000  # from design doc
-    points_ok = len(converter.path_data) <= max_points
+    points_ok = len(arrays.pen) <= max_points
     
     print(f"📊 Complexity constraints (max {max_points} points):")
-    print(f"   Total points: {len(converter.path_data)} {'✓' if points_ok else '❌ TOO COMPLEX'}")
+    print(f"   Total points: {len(arrays.pen)} {'✓' if points_ok else '❌ TOO COMPLEX'}")
     print()
     
     # Check minimum feature size
     min_segment = 0.3  # mm from design doc
-    small_segments = 0
-    
-    for i in range(1, len(converter.path_data)):
-        prev = converter.path_data[i-1]
-        curr = converter.path_data[i]
-        if curr.pen_down:
-            dx = curr.x - prev.x
-            dy = curr.y - prev.y
-            dist = (dx**2 + dy**2) ** 0.5
-            if dist < min_segment and dist > 0:
-                small_segments += 1
+    small_segments = int(((arrays.steps < min_segment) & (arrays.steps > 0) & arrays.pen[1:]).sum())
     
     print(f"🔍 Feature size check (min {min_segment} mm):")
     print(f"   Segments < {min_segment}mm: {small_segments}")
@@ -288,16 +333,17 @@ def main():
         return
     
     # Test 2: Analyze path data
-    analyze_path_data(converter)
+    arrays = path_arrays(converter)
+    analyze_path_data(arrays)
     
     # Test 3: Validate constraints
-    validate_svg_constraints(converter)
+    validate_svg_constraints(arrays)
     
-    # Test 4: Generate motor instructions
-    instructions_json = show_motor_instructions(converter)
+    # Test 4: Generate motor instructions (decoded once, reused below)
+    instructions = show_motor_instructions(converter)
     
-    # Test 5: Save instructions
-    save_instructions(instructions_json)
+    # Test 5: Save instructions (encoded once, compact separators)
+    instructions_json = save_instructions(instructions)
     
     # Test 6: Try connecting to plotter (if not dry run)
     if not DRY_RUN:
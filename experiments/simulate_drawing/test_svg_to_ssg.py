@@ -10,7 +10,12 @@ This script:
 4. Simulates and visualizes the result
 """
 
+import importlib.util
+import math
+import os
 import sys
+import traceback
+from itertools import islice
 from pathlib import Path
 
 # Add motor_movement to path
@@ -19,26 +24,70 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "motor_movement"))
 from ssg_compiler import SSGCompiler
 import config
 
+try:
+    from numba import njit  # Optional: compiles the bounds scan below
+except ImportError:
+    njit = None
 
-def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _bounds_stats(xs, ys):
+        """
+        Fused bounds / plate-radius scan (one compiled pass)
+        
+        Returns:
+            (min_x, max_x, min_y, max_y, max squared distance from the origin)
+        """
+        min_x = max_x = xs[0]
+        min_y = max_y = ys[0]
+        max_r2 = 0.0
+        for i in range(len(xs)):
+            x = xs[i]
+            y = ys[i]
+            min_x = min(min_x, x)
+            max_x = max(max_x, x)
+            min_y = min(min_y, y)
+            max_y = max(max_y, y)
+            max_r2 = max(max_r2, x * x + y * y)
+        return min_x, max_x, min_y, max_y, max_r2
+else:
+    def _bounds_stats(xs, ys):
+        """
+        Bounds / plate-radius scan with NumPy reductions
+        
+        Returns:
+            (min_x, max_x, min_y, max_y, max squared distance from the origin)
+        """
+        return xs.min(), xs.max(), ys.min(), ys.max(), (xs * xs + ys * ys).max()
+
+
+def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None, plot: bool = True):
     """
     Complete test of SVG → SSG conversion with visualization
     
     Args:
         svg_file: Path to input SVG file
         output_name: Optional output filename (without extension)
+        plot: Simulate and render the preview images (False for a fast
+              compile + constraints check)
     """
     svg_path = Path(svg_file)
     
+    # Design limits checked in step 2 (read from config once)
+    canvas_width, canvas_height = config.CANVAS_WIDTH_MM, config.CANVAS_HEIGHT_MM
+    plate_radius = config.PLATE_RADIUS_MM
+    max_commands = config.MAX_COMMANDS_PER_JOB
+    
     if not svg_path.exists():
         print(f"❌ Error: SVG file not found: {svg_file}")
         return False
     
-    # Generate output filename
-    if output_name:
-        ssg_file = Path(__file__).parent / f"{output_name}.ssg"
-    else:
-        ssg_file = Path(__file__).parent / f"{svg_path.stem}_output.ssg"
+    # Generate output filenames (all next to this script)
+    out_dir = Path(__file__).parent
+    ssg_file = out_dir / f"{output_name or svg_path.stem + '_output'}.ssg"
+    preview_png = out_dir / 'simulation_preview.png'
+    sequence_png = out_dir / 'simulation_sequence.png'
     
     print("=" * 70)
     print("SVG TO SSG CONVERSION TEST")
@@ -47,6 +96,7 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
     print(f"📄 Input:  {svg_path}")
     print(f"📄 Output: {ssg_file}")
     print()
+    sys.stdout.flush()
     
     # Step 1: Compile SVG to SSG
     print("STEP 1: COMPILING SVG")
@@ -62,29 +112,35 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
         ssg_commands = compiler.compile_to_ssg()
         compiler.save_ssg(str(ssg_file))
         
-        # Get statistics
+        # Get statistics (values reused below bound once)
         stats = compiler.get_statistics()
+        num_commands = stats['num_commands']
+        estimated_time = stats['estimated_time_sec']
+        warnings = stats['warnings']
         
         print()
         print("✅ Compilation Results:")
         print(f"   Paths: {stats['num_paths']}")
-        print(f"   SSG Commands: {stats['num_commands']}")
+        print(f"   SSG Commands: {num_commands}")
         print(f"   Total length: {stats['total_length_mm']:.1f} mm")
         print(f"   Rapid moves: {stats['rapid_moves']}")
         print(f"   Draw moves: {stats['draw_moves']}")
-        print(f"   Estimated time: {stats['estimated_time_sec']:.1f}s ({stats['estimated_time_sec']/60:.1f} min)")
+        print(f"   Estimated time: {estimated_time:.1f}s ({estimated_time/60:.1f} min)")
         
-        if stats['warnings']:
+        if warnings:
             print()
             print("⚠️  Warnings:")
-            for warning in stats['warnings']:
+            for warning in warnings:
                 print(f"   • {warning}")
         
         print()
+        sys.stdout.flush()
         
     except Exception as e:
+        # Any failure on bad input is reported, not raised (KeyboardInterrupt
+        # and SystemExit are not Exceptions, so they still propagate)
         print(f"❌ Compilation failed: {e}")
-        import traceback
+        sys.stdout.flush()
         traceback.print_exc()
         return False
     
@@ -93,29 +149,29 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
     print("STEP 2: DESIGN CONSTRAINTS VALIDATION")
     print("-" * 70)
     
-    # Bounds check
-    all_x = [p.x for path in compiler.paths for p in path.points]
-    all_y = [p.y for path in compiler.paths for p in path.points]
+    # Bounds check over the compiler's cached vertex array
+    xy = compiler.vertices()
     
-    if all_x and all_y:
-        width = max(all_x) - min(all_x)
-        height = max(all_y) - min(all_y)
+    if len(xy):
+        xs, ys = xy[:, 0], xy[:, 1]
+        min_x, max_x, min_y, max_y, max_r2 = _bounds_stats(xs, ys)
+        width = float(max_x - min_x)
+        height = float(max_y - min_y)
         
         print(f"📏 Drawing size: {width:.1f}mm × {height:.1f}mm")
-        print(f"   Max allowed: {config.CANVAS_WIDTH_MM}mm × {config.CANVAS_HEIGHT_MM}mm")
+        print(f"   Max allowed: {canvas_width}mm × {canvas_height}mm")
         
-        if width <= config.CANVAS_WIDTH_MM and height <= config.CANVAS_HEIGHT_MM:
+        if width <= canvas_width and height <= canvas_height:
             print("   ✅ Size OK")
         else:
             print("   ⚠️  WARNING: Drawing may be too large for plate!")
         
         # Check plate radius
-        import math
-        max_dist = max(math.sqrt(x**2 + y**2) for x, y in zip(all_x, all_y))
+        max_dist = math.sqrt(max_r2)
         print(f"   Max distance from center: {max_dist:.1f}mm")
-        print(f"   Plate radius: {config.PLATE_RADIUS_MM}mm")
+        print(f"   Plate radius: {plate_radius}mm")
         
-        if max_dist <= config.PLATE_RADIUS_MM:
+        if max_dist <= plate_radius:
             print("   ✅ Fits within plate")
         else:
             print("   ⚠️  WARNING: Some points outside plate boundary!")
@@ -123,15 +179,16 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
     # Complexity check
     print()
     print(f"📊 Complexity:")
-    print(f"   Total commands: {stats['num_commands']}")
-    print(f"   Max allowed: {config.MAX_COMMANDS_PER_JOB}")
+    print(f"   Total commands: {num_commands}")
+    print(f"   Max allowed: {max_commands}")
     
-    if stats['num_commands'] <= config.MAX_COMMANDS_PER_JOB:
+    if num_commands <= max_commands:
         print("   ✅ Complexity OK")
     else:
         print("   ⚠️  WARNING: Too many commands!")
     
     print()
+    sys.stdout.flush()
     
     # Step 3: Show preview of SSG commands
     print()
@@ -139,13 +196,14 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
     print("-" * 70)
     print()
     print("First 15 commands:")
-    for i, cmd in enumerate(ssg_commands[:15]):
+    for cmd in islice(ssg_commands, 15):
         print(f"  {cmd}")
     
     if len(ssg_commands) > 15:
         print(f"  ... ({len(ssg_commands) - 15} more commands)")
     
     print()
+    sys.stdout.flush()
     
     # Step 4: Simulate and visualize
     print()
@@ -153,34 +211,44 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
     print("-" * 70)
     print()
     
-    try:
-        from ssg_simulator import SSGSimulator
-        
-        # Create simulator
-        sim = SSGSimulator(ssg_file)
-        
-        # Simulate
-        sim.simulate()
-        sim.analyze()
-        
-        # Generate visualizations
-        print()
-        print("Generating visualizations...")
-        sim.plot(show_travel=True, show_grid=True, show_plate=True)
-        sim.plot_time_sequence()
-        
-        print()
-        print("✅ Visualizations saved:")
-        print(f"   • {ssg_file.parent / 'simulation_preview.png'}")
-        print(f"   • {ssg_file.parent / 'simulation_sequence.png'}")
-        
-    except ImportError:
+    if not plot:
+        print("⏭️  Skipped (--no-plot)")
+    elif importlib.util.find_spec("matplotlib") is None:
         print("⚠️  matplotlib not installed - skipping visualization")
         print("   Install with: pip install matplotlib")
-    except Exception as e:
-        print(f"⚠️  Visualization failed: {e}")
+    else:
+        try:
+            # Figures are only saved here, so skip GUI backend probing
+            # (an explicit MPLBACKEND still wins)
+            os.environ.setdefault("MPLBACKEND", "Agg")
+            from ssg_simulator import SSGSimulator
+            
+            # Create simulator
+            sim = SSGSimulator(ssg_file)
+            
+            # Simulate
+            sim.simulate()
+            sim.analyze()
+            
+            # Generate visualizations
+            print()
+            print("Generating visualizations...")
+            sim.plot(show_travel=True, show_grid=True, show_plate=True)
+            sim.plot_time_sequence()
+            
+            print()
+            print("✅ Visualizations saved:")
+            print(f"   • {preview_png}")
+            print(f"   • {sequence_png}")
+            
+        except ImportError:
+            print("⚠️  matplotlib not installed - skipping visualization")
+            print("   Install with: pip install matplotlib")
+        except Exception as e:
+            print(f"⚠️  Visualization failed: {e}")
     
     print()
+    sys.stdout.flush()
     
     # Summary
     print("=" * 70)
@@ -189,14 +257,16 @@ def test_svg_to_ssg_pipeline(svg_file: str, output_name: str = None):
     print()
     print("Output files created:")
     print(f"  • {ssg_file}")
-    print(f"  • {ssg_file.parent / 'simulation_preview.png'}")
-    print(f"  • {ssg_file.parent / 'simulation_sequence.png'}")
+    if plot:
+        print(f"  • {preview_png}")
+        print(f"  • {sequence_png}")
     print()
     print("Next steps:")
     print("  1. Review the visualizations")
     print("  2. If OK, use with test_end_to_end.py:")
     print(f"     python ../motor_movement/test_end_to_end.py {svg_path}")
     print()
+    sys.stdout.flush()
     
     return True
 
@@ -218,15 +288,24 @@ Examples:
   
   # Test with motor_movement test patterns
   python test_svg_to_ssg.py ../motor_movement/test_square.svg
+  
+  # Compile and check constraints only (no simulation/plots)
+  python test_svg_to_ssg.py ../svgs/best_result.svg --no-plot
         """
     )
     
     parser.add_argument("svg_file", help="Input SVG file")
     parser.add_argument("--output", "-o", help="Output name (without .ssg extension)")
+    parser.add_argument("--no-plot", action="store_true", default=bool(os.environ.get('CI')),
+                        help="Skip simulation and preview rendering (default when CI is set)")
     
     args = parser.parse_args()
     
-    success = test_svg_to_ssg_pipeline(args.svg_file, args.output)
+    # Block-buffer stdout (even on a terminal): each step's report goes out
+    # in one write when the pipeline flushes at the end of the step
+    sys.stdout.reconfigure(line_buffering=False)
+    
+    success = test_svg_to_ssg_pipeline(args.svg_file, args.output, plot=not args.no_plot)
     
     sys.exit(0 if success else 1)
 